@@ -47,7 +47,7 @@ async def get_user_from_api_key(db: AsyncSession, api_key: str) -> User:
             logger
         )
 
-    if not db_api_key.verify_key(api_key):
+    if not await db_api_key.verify_key(api_key):
         raise InvalidApiKeyError(
             f"Can't verify API key: {api_key[:8]}...",
             logger
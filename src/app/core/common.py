@@ -3,6 +3,10 @@ from datetime import date, datetime
 
 from app.core.exceptions import BadRequestError
 
+# Filename sanitization patterns, compiled once
+FILENAME_INVALID_CHARS = re.compile(r'[^a-z0-9-]')
+FILENAME_REPEATED_SEPARATORS = re.compile(r'[-_]{2,}')
+
 
 def parse_date(date_str: str) -> date | None:
     """
@@ -64,10 +68,10 @@ def sanitize_filename(filename: str) -> str:
     sanitized = name.lower()
 
     # Replace spaces and other special characters with underscore
-    sanitized = re.sub(r'[^a-z0-9-]', '_', sanitized)
+    sanitized = FILENAME_INVALID_CHARS.sub('_', sanitized)
 
     # Remove consecutive underscores/hyphens
-    sanitized = re.sub(r'[-_]{2,}', '_', sanitized)
+    sanitized = FILENAME_REPEATED_SEPARATORS.sub('_', sanitized)
 
     # Remove leading/trailing underscores/hyphens
     sanitized = sanitized.strip('_-')
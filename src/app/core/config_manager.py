@@ -1,7 +1,11 @@
 import os
+from typing import Optional
 
 import yaml
 
+# Use the libyaml based loader when PyYAML was built with it, it's much faster than the pure Python one
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 class ConfigManager:
     """
@@ -9,9 +13,12 @@ class ConfigManager:
     separate environments and overrides using environment variables.
     """
 
-    def __init__(self):
+    def __init__(self, config_dict: Optional[dict] = None):
         """
         Initializes the configuration manager.
+
+        :param config_dict: Configuration to use instead of the YAML files, ex. in tests;
+            environment variable overrides still apply
         """
         # Configuration folder path
         self.app_configs_path = os.environ.get('CAPI_CONF_PATH', 'app-configs')
@@ -28,7 +35,7 @@ class ConfigManager:
         if not self.env_name:
             self.env_name = 'local'
         # Load configuration
-        self.loaded_config = self.load()
+        self.loaded_config = self.load(config_dict)
 
     @property
     def database_url(self) -> str:
@@ -39,25 +46,20 @@ class ConfigManager:
         """
         return f"postgresql+asyncpg://{self.db_user}:{self.db_pass}@{self.db_host}:{self.db_port}/{self.db_name}"
 
-    def load(self) -> dict:
+    def load(self, config_dict: Optional[dict] = None) -> dict:
         """
         Loads configuration from the base directory, with environment-specific overrides
         and the ability to override values with environment variables.
 
+        :param config_dict: Configuration to use instead of the YAML files
         :return: The merged configuration dictionary.
         """
 
-        # Default configuration
-        default_file = os.path.join(self.app_configs_path, 'default.yml')
-        # Environment specific configuration
-        env_file = os.path.join(self.app_configs_path, f'{self.env_name}.yml')
-
-        loaded_config = {}
-        # Load configuration from config files
-        for file in (default_file, env_file):
-            if os.path.exists(file):
-                with open(file, 'r') as f:
-                    loaded_config.update(yaml.safe_load(f))
+        if config_dict is not None:
+            # Skip the config files, ex. in tests that don't exercise file loading
+            loaded_config = dict(config_dict)
+        else:
+            loaded_config = self.load_files()
 
         # Override configuration with environment variables
         for key, value in loaded_config.items():
@@ -74,10 +76,32 @@ class ConfigManager:
 
         # Set configuration as environment variables,
         # for libraries like google (ex. GOOGLE_APPLICATION_CREDENTIALS)
-        # that look at env vars for configuration
+        # that look at env vars for configuration;
+        # only changed values are written, since every write calls `putenv()`
         for key, value in loaded_config.items():
-            os.environ[key] = str(value)
+            value = str(value)
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+
+        return loaded_config
 
+    def load_files(self) -> dict:
+        """
+        Loads configuration from the default and environment-specific YAML files.
+
+        :return: The merged configuration dictionary.
+        """
+        # Default configuration
+        default_file = os.path.join(self.app_configs_path, 'default.yml')
+        # Environment specific configuration
+        env_file = os.path.join(self.app_configs_path, f'{self.env_name}.yml')
+
+        loaded_config = {}
+        # Load configuration from config files
+        for file in (default_file, env_file):
+            if os.path.exists(file):
+                with open(file, 'r') as f:
+                    loaded_config.update(yaml.load(f, Loader=YamlLoader))
         return loaded_config
 
     def __getattr__(self, attr):
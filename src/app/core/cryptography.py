@@ -1,4 +1,7 @@
+import asyncio
+import os
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 
 from bcrypt import hashpw, checkpw, gensalt
 
@@ -8,6 +11,12 @@ from app.core.utils import setup_logger
 # Set up logger
 logger = setup_logger(__name__, add_stdout=config.log_stdout, log_level=config.log_level)
 
+# bcrypt cost factor; each extra round doubles the time to hash or verify
+BCRYPT_ROUNDS = 12
+
+# Threads for bcrypt work off the event loop; bcrypt releases the GIL, so these run in parallel
+_bcrypt_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='bcrypt')
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -22,6 +31,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash, without blocking the event loop.
+
+    Args:
+        plain_password (str): The plain text password.
+        hashed_password (str): The hashed password.
+    Returns:
+        bool: Whether the password is correct.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, verify_password, plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Generate a hash for a password.
@@ -31,7 +54,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: The hashed password.
     """
-    return hashpw(password.encode('utf-8'), gensalt()).decode('utf-8')
+    return hashpw(password.encode('utf-8'), gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 
 def generate_api_key() -> tuple[str, str]:
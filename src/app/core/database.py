@@ -5,7 +5,16 @@ from sqlalchemy.orm import sessionmaker
 from app.core.config_manager import config
 
 # Create the database engine
-engine = create_async_engine(config.database_url, echo=config.sqlalchemy_log_all)
+engine = create_async_engine(
+    config.database_url,
+    echo=config.sqlalchemy_log_all,
+    # Size the pool for the API plus concurrently running background tasks
+    pool_size=int(config.db_pool_size),
+    max_overflow=int(config.db_max_overflow),
+    # Replace connections before the server or a proxy drops them, and check them before use
+    pool_recycle=1800,
+    pool_pre_ping=True
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
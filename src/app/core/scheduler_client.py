@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 
 import aiohttp
@@ -19,6 +19,27 @@ logger = setup_logger(__name__)
 
 INTERNAL_API_URL = config.scheduler_zen_url
 
+# HTTP session shared by all scheduler requests, to reuse keep-alive connections
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session for the scheduler API, creating it if needed."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, keepalive_timeout=60, ttl_dns_cache=300)
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared HTTP session for the scheduler API."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
 
 async def start_fine_tuning_job(db: AsyncSession, job_id: UUID, user_id: UUID) -> None:
     """Start a fine-tuning job via scheduler."""
@@ -79,24 +100,24 @@ async def start_fine_tuning_job(db: AsyncSession, job_id: UUID, user_id: UUID) -
         payload["args"]["override_env"] = config.env_name
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                    f"{INTERNAL_API_URL}/jobs/{job.provider.value.lower()}",
-                    json=payload
-            ) as response:
-                if response.status == 200:
-                    logger.info(f"Started fine-tuning job: {job_id}")
-                elif response.status == 422:
-                    error_data = await response.json()
-                    raise FineTuningJobCreationError(
-                        f"Failed to start job {job_id}: {error_data['message']}",
-                        logger
-                    )
-                else:
-                    raise FineTuningJobCreationError(
-                        f"Failed to start job {job_id}: {await response.text()}",
-                        logger
-                    )
+        session = _get_session()
+        async with session.post(
+                f"{INTERNAL_API_URL}/jobs/{job.provider.value.lower()}",
+                json=payload
+        ) as response:
+            if response.status == 200:
+                logger.info(f"Started fine-tuning job: {job_id}")
+            elif response.status == 422:
+                error_data = await response.json()
+                raise FineTuningJobCreationError(
+                    f"Failed to start job {job_id}: {error_data['message']}",
+                    logger
+                )
+            else:
+                raise FineTuningJobCreationError(
+                    f"Failed to start job {job_id}: {await response.text()}",
+                    logger
+                )
 
     except Exception as e:
         # Update job status to failed
@@ -132,17 +153,54 @@ async def fetch_job_details(
     user_id_str = str(user_id)
     job_ids_str = [str(job_id) for job_id in job_ids]
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-                f"{INTERNAL_API_URL}/jobs/get_by_user_and_ids",
-                json={"user_id": user_id_str, "job_ids": job_ids_str}
-        ) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                raise FineTuningJobRefreshError(
-                    f"Error refreshing job statuses: {await response.text()}"
-                )
+    session = _get_session()
+    async with session.post(
+            f"{INTERNAL_API_URL}/jobs/get_by_user_and_ids",
+            json={"user_id": user_id_str, "job_ids": job_ids_str}
+    ) as response:
+        if response.status == 200:
+            return await response.json()
+        else:
+            raise FineTuningJobRefreshError(
+                f"Error refreshing job statuses: {await response.text()}"
+            )
+
+
+async def fetch_job_details_bulk(
+        jobs_by_user: Dict[UUID, List[UUID]]
+) -> List[Dict[str, Any]]:
+    """
+    Get job status updates for many users from scheduler in a single request.
+
+    Args:
+        jobs_by_user: Job IDs to check, grouped by user ID
+
+    Returns:
+        List of job status details, for all users
+
+    Raises:
+        FineTuningJobRefreshError: If update fails
+    """
+    if not config.run_with_scheduler:
+        logger.info("Scheduler API is disabled")
+        return []
+
+    payload = [
+        {"user_id": str(user_id), "job_ids": [str(job_id) for job_id in job_ids]}
+        for user_id, job_ids in jobs_by_user.items()
+    ]
+
+    session = _get_session()
+    async with session.post(
+            f"{INTERNAL_API_URL}/jobs/get_by_users_and_ids",
+            json=payload
+    ) as response:
+        if response.status == 200:
+            return await response.json()
+        else:
+            raise FineTuningJobRefreshError(
+                f"Error refreshing job statuses: {await response.text()}"
+            )
 
 
 async def stop_fine_tuning_job(job_id: UUID, user_id: UUID) -> None:
@@ -160,20 +218,20 @@ async def stop_fine_tuning_job(job_id: UUID, user_id: UUID) -> None:
         logger.info("Scheduler API is disabled")
         return
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-                f"{INTERNAL_API_URL}/jobs/gcp/stop/{job_id}/{user_id}"
-        ) as response:
-            if response.status == 200:
-                logger.info(f"Requested stop for job: {job_id}")
-                return await response.json()
-            elif response.status == 404:
-                raise FineTuningJobCancellationError(
-                    f"Job not found or not running: {job_id}",
-                    logger
-                )
-            else:
-                raise FineTuningJobCancellationError(
-                    f"Failed to stop job {job_id}: {await response.text()}",
-                    logger
-                )
+    session = _get_session()
+    async with session.post(
+            f"{INTERNAL_API_URL}/jobs/gcp/stop/{job_id}/{user_id}"
+    ) as response:
+        if response.status == 200:
+            logger.info(f"Requested stop for job: {job_id}")
+            return await response.json()
+        elif response.status == 404:
+            raise FineTuningJobCancellationError(
+                f"Job not found or not running: {job_id}",
+                logger
+            )
+        else:
+            raise FineTuningJobCancellationError(
+                f"Failed to stop job {job_id}: {await response.text()}",
+                logger
+            )
@@ -1,8 +1,9 @@
 import datetime
 import os
+from typing import Optional
 from uuid import UUID
 
-from aiohttp import ClientSession, ClientResponseError
+from aiohttp import ClientSession, ClientResponseError, TCPConnector
 from fastapi import UploadFile
 from gcloud.aio.storage import Storage
 
@@ -12,6 +13,49 @@ from app.core.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+# GCS client shared by background tasks, to reuse keep-alive connections across runs
+_session: Optional[ClientSession] = None
+_storage: Optional[Storage] = None
+
+
+def get_storage() -> Storage:
+    """Get the shared GCS client, creating it and its HTTP session if needed."""
+    global _session, _storage
+    if _storage is None or _session.closed:
+        # Keep enough connections alive for the weights cleanup's concurrent deletes (100 at once),
+        # so they reuse warm connections instead of reconnecting
+        _session = ClientSession(
+            connector=TCPConnector(limit=100, keepalive_timeout=60, ttl_dns_cache=300)
+        )
+        _storage = Storage(session=_session)
+    return _storage
+
+
+async def warm_up_storage() -> None:
+    """
+    Create the shared GCS client and fetch its access token ahead of first use.
+
+    Credential discovery can take a round-trip to the metadata server, so do it at startup
+    instead of in the first background task; failures are logged, and retried on first use.
+    """
+    storage = get_storage()
+    if storage.token is None:
+        return
+    try:
+        await storage.token.get()
+    except Exception as e:
+        logger.warning(f"Failed to fetch GCS access token at startup: {str(e)}")
+
+
+async def close_storage() -> None:
+    """Close the shared GCS client's HTTP session."""
+    global _session, _storage
+    # `Storage.close()` leaves sessions it was given open, so close ours directly
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _storage = None
+
 
 def handle_gcs_error(e: ClientResponseError, file_path: str) -> None:
     """Handle Google Cloud Storage errors."""
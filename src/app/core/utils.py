@@ -1,20 +1,67 @@
+import atexit
+import functools
 import json
 import logging
 import os
+import queue
 import sys
-from logging.handlers import TimedRotatingFileHandler
-from typing import TypeVar, Any
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
+from typing import TypeVar, Any, Dict, Optional
 
 from app.core.config_manager import config
 
 T = TypeVar('T')
 
+# Log queues, keyed by whether records also go to stdout; each is drained by a listener thread
+_log_queues: Dict[bool, queue.Queue] = {}
+# Log file handler, shared by all listeners so the file is only rotated by one handler
+_file_handler: Optional[TimedRotatingFileHandler] = None
 
+
+def _get_file_handler() -> TimedRotatingFileHandler:
+    """Get the log file handler, creating it if needed."""
+    global _file_handler
+    if _file_handler is None:
+        os.makedirs(os.path.dirname(config.log_file), exist_ok=True)
+        _file_handler = TimedRotatingFileHandler(config.log_file, when="midnight", interval=1, backupCount=2)
+        _file_handler.suffix = "%Y%m%d"
+        _file_handler.setFormatter(logging.Formatter(f'{config.env_name} - %(asctime)s - %(message)s'))
+    return _file_handler
+
+
+def _get_log_queue(add_stdout: bool) -> queue.Queue:
+    """
+    Get the queue for log records, creating its handlers and listener if needed.
+
+    Handlers write to file, and stdout if requested, on the listener's thread, so logging
+    doesn't block the event loop on I/O; they're shared by all loggers, instead of opening
+    the log file once per logger.
+    """
+    if add_stdout in _log_queues:
+        return _log_queues[add_stdout]
+
+    handlers = [_get_file_handler()]
+    if add_stdout:
+        stdout_handler = logging.StreamHandler(sys.stdout)
+        stdout_handler.setFormatter(_get_file_handler().formatter)
+        handlers.append(stdout_handler)
+
+    # Start the listener, and flush pending records on exit
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    _log_queues[add_stdout] = log_queue
+    return log_queue
+
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str,
                  add_stdout: bool = True,
                  log_level: int = logging.INFO) -> logging.Logger:
     """
-    Sets up a logger
+    Sets up a logger; repeated calls with the same arguments return the same logger
 
     Args:
         name (str): The name of the logger.
@@ -24,24 +71,12 @@ def setup_logger(name: str,
         logging.Logger: The logger instance.
     """
     log_level = log_level or config.log_level
-    log_format = logging.Formatter(f'{config.env_name} - %(asctime)s - %(message)s')
-
-    # Log to stdout and to file
-    os.makedirs(os.path.dirname(config.log_file), exist_ok=True)
-    stdout_handler = logging.StreamHandler(sys.stdout)
-    file_handler = TimedRotatingFileHandler(config.log_file, when="midnight", interval=1, backupCount=2)
-    file_handler.suffix = "%Y%m%d"
-
-    # Set the logger format
-    stdout_handler.setFormatter(log_format)
-    file_handler.setFormatter(log_format)
 
-    # Configure logger
+    # Configure logger; records are handed off to a queue, and written by a listener thread
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
-    if add_stdout and config.log_stdout:
-        logger.addHandler(stdout_handler)
-    logger.addHandler(file_handler)
+    if not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        logger.addHandler(QueueHandler(_get_log_queue(bool(add_stdout and config.log_stdout))))
     return logger
 
 
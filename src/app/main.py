@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import stripe
 import uvicorn
@@ -21,9 +22,7 @@ from app.core.exceptions import (
     generic_exception_handler,
 )
 from app.routes import users, api_keys, datasets, fine_tuning, models, usage, auth0, billing
-from app.tasks.api_key_cleanup import cleanup_expired_api_keys
-from app.tasks.job_status_updater import update_job_statuses
-from app.tasks.model_cleanup import cleanup_deleted_model_weights
+from app.tasks.worker import add_background_tasks, shared_clients, supervise_worker_process
 
 # Create the background task scheduler instance
 background_task_scheduler = AsyncIOScheduler()
@@ -38,22 +37,29 @@ async def lifespan(app: FastAPI):
     # Run database migrations
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    # Add the job weights cleanup task to the background scheduler
-    background_task_scheduler.add_job(cleanup_deleted_model_weights, 'interval', minutes=1)
-    # Add the API key cleanup task to the background scheduler
-    background_task_scheduler.add_job(cleanup_expired_api_keys, 'interval', minutes=1)
-    # Add the job status updater task to the background scheduler
-    if config.run_with_scheduler:
-        background_task_scheduler.add_job(update_job_statuses, 'interval', seconds=15)
-    # Start the background scheduler
-    background_task_scheduler.start()
+    # Open the shared clients, and close them on shutdown; the GCS client is only
+    # warmed up if the background tasks run in this process
+    async with shared_clients(warm_up=not config.background_tasks_in_worker):
+        if config.background_tasks_in_worker:
+            # Run the background tasks in a separate worker process, restarted if it exits
+            worker_task = asyncio.create_task(supervise_worker_process())
+        else:
+            worker_task = None
+            # Add the background tasks to the background scheduler, and start it
+            add_background_tasks(background_task_scheduler)
+            background_task_scheduler.start()
 
-    yield
+        yield
 
-    # Shutdown
-    # --------
-    # Stop the background scheduler
-    background_task_scheduler.shutdown()
+        # Shutdown
+        # --------
+        # Stop the background scheduler, or worker process
+        if worker_task:
+            worker_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker_task
+        else:
+            background_task_scheduler.shutdown()
 
 app = FastAPI(title="LLM Fine-tuning API", lifespan=lifespan)
 
@@ -3,7 +3,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.constants import ApiKeyStatus
-from app.core.cryptography import verify_password
+from app.core.cryptography import verify_password_async
 from app.core.database import Base
 
 
@@ -44,16 +44,16 @@ class ApiKey(Base):
         UniqueConstraint('user_id', 'name', name='uq_api_key_user_id_name'),
     )
 
-    def verify_key(self, api_key: str) -> bool:
+    async def verify_key(self, api_key: str) -> bool:
         """
-        Verify the provided API key against the stored hashed key.
+        Verify the provided API key against the stored hashed key, off the event loop.
 
         Args:
             api_key (str): The API key to verify.
         Returns:
             bool: True if the key is valid, False otherwise.
         """
-        return verify_password(api_key, self.key_hash)
+        return await verify_password_async(api_key, self.key_hash)
 
     def __repr__(self) -> str:
         return f"<ApiKey(id={self.id}, user_id={self.user_id}, name={self.name}, status={self.status})>"
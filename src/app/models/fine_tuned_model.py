@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, JSON, ForeignKey, UniqueConstraint, Enum
+from sqlalchemy import Column, String, DateTime, UUID, JSON, ForeignKey, UniqueConstraint, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -43,6 +43,9 @@ class FineTunedModel(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('user_id', 'name', name='uq_fine_tuned_model_user_id_name'),
+        # Partial index for the model weights cleanup, which polls recently deleted models
+        Index('idx_fine_tuned_models_deleted', updated_at,
+              postgresql_where=status == FineTunedModelStatus.DELETED),
     )
 
     def __repr__(self) -> str:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Integer, BigInteger, ForeignKey, UniqueConstraint, Enum
+from sqlalchemy import Column, String, DateTime, UUID, Integer, BigInteger, ForeignKey, UniqueConstraint, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -65,6 +65,12 @@ class FineTuningJob(Base):
     # Indexes
     __table_args__ = (
         UniqueConstraint('user_id', 'name', name='uq_fine_tuning_job_user_id_name'),
+        # Partial indexes for the job status updater, which polls active and recently completed jobs
+        Index('idx_fine_tuning_jobs_active', user_id,
+              postgresql_where=status.in_([FineTuningJobStatus.NEW, FineTuningJobStatus.QUEUED,
+                                           FineTuningJobStatus.RUNNING, FineTuningJobStatus.STOPPING])),
+        Index('idx_fine_tuning_jobs_completed', updated_at.desc(),
+              postgresql_where=status == FineTuningJobStatus.COMPLETED),
     )
 
     def __repr__(self) -> str:
@@ -2,7 +2,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy import select, func, update, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
 
 from app.core.constants import ApiKeyStatus
 from app.models.api_key import ApiKey
@@ -47,12 +47,12 @@ async def count_api_keys(db: AsyncSession, user_id: UUID) -> int:
     return result.scalar_one()
 
 
-async def mark_expired_keys(db: AsyncSession) -> int:
+async def mark_expired_keys(db: AsyncSession | AsyncConnection) -> int:
     """
     Mark expired API keys as EXPIRED.
 
     Args:
-        db: Database session
+        db: Database session or connection
 
     Returns:
         Number of keys marked as expired
@@ -71,10 +71,6 @@ async def mark_expired_keys(db: AsyncSession) -> int:
         .values(
             status=ApiKeyStatus.EXPIRED
         )
-        .returning(ApiKey.id)
     )
 
-    updated_keys = result.scalars().all()
-    count = len(updated_keys)
-
-    return count
+    return result.rowcount
@@ -1,20 +1,21 @@
 from datetime import datetime, timezone
-from typing import Tuple, List
+from typing import Tuple, List, Union
 
 from sqlalchemy import Select, select, func, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BadRequestError
 from app.core.utils import T
-from app.schemas.common import Pagination
+from app.schemas.common import Pagination, PaginationWithoutTotal
 
 
 async def paginate_query(
         db: AsyncSession,
         query: Select,
         page: int,
-        items_per_page: int
-) -> Tuple[List[T], Pagination]:
+        items_per_page: int,
+        include_total: bool = True
+) -> Tuple[List[T], Union[Pagination, PaginationWithoutTotal]]:
     """
     Paginate a query and return the items and pagination object.
 
@@ -23,34 +24,39 @@ async def paginate_query(
         query (Select): The SQLAlchemy query.
         page (int): The page number.
         items_per_page (int): The number of items per page.
+        include_total (bool): Whether to count the total number of pages; if False, only
+            whether there's a next page is returned, which skips counting all rows.
     Returns:
-        Tuple[List[T], Pagination]: A tuple of the items and pagination object.
+        Tuple[List[T], Union[Pagination, PaginationWithoutTotal]]: A tuple of the items and
+            pagination object; a `PaginationWithoutTotal` if `include_total` is False.
     """
     # Validate inputs
     if page < 1 or items_per_page < 1:
         raise BadRequestError("`page` and `items_per_page` must be positive integers")
 
-    # Count total items
-    count_query = select(func.count()).select_from(query.subquery())
-    total_count = await db.scalar(count_query)
+    offset = (page - 1) * items_per_page
 
-    # Calculate total pages and validate if page is out of range
-    total_pages = (total_count + items_per_page - 1) // items_per_page
-    if page > total_pages:
-        return [], Pagination(
-            total_pages=total_pages,
-            current_page=page,
-            items_per_page=items_per_page,
-        )
+    if not include_total:
+        return await _paginate_query_without_total(db, query, page, items_per_page, offset)
 
-    offset = (page - 1) * items_per_page
+    # Fetch items and the total count in a single query, with a window function
+    windowed_query = query.add_columns(func.count().over().label('total_count'))
+    result = (await db.execute(windowed_query.offset(offset).limit(items_per_page))).freeze()
+
+    # Strip the count column, the last one in each row, keeping rows' named columns;
+    # use the row width, since `selected_columns` lists every mapped column of an entity select
+    count_index = len(result().keys()) - 1
+    items = _unwrap_rows(result().columns(*range(count_index)).all())
 
-    # Fetch items
-    result = await db.execute(query.offset(offset).limit(items_per_page))
-    items = result.all()
+    if items:
+        total_count = result().scalars(count_index).first()
+    elif page > 1:
+        # No rows to carry the count when the page is out of range, so count separately
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
+    else:
+        total_count = 0
 
-    if items and isinstance(items[0], Row) and len(items[0]) == 1:
-        items = [item[0] for item in items]
+    total_pages = (total_count + items_per_page - 1) // items_per_page
 
     # Create pagination object
     pagination = Pagination(
@@ -63,6 +69,32 @@ async def paginate_query(
     return items, pagination
 
 
+async def _paginate_query_without_total(
+        db: AsyncSession,
+        query: Select,
+        page: int,
+        items_per_page: int,
+        offset: int
+) -> Tuple[List[T], PaginationWithoutTotal]:
+    """Paginate a query without counting its rows; fetch one extra row to tell if there's a next page."""
+    result = await db.execute(query.offset(offset).limit(items_per_page + 1))
+    items = _unwrap_rows(result.all())
+
+    pagination = PaginationWithoutTotal(
+        current_page=page,
+        items_per_page=items_per_page,
+        has_next=len(items) > items_per_page,
+    )
+    return items[:items_per_page], pagination
+
+
+def _unwrap_rows(rows: List[Row]) -> List[T]:
+    """Unwrap single entity or single column rows into their values, and keep other rows as is."""
+    if rows and len(rows[0]) == 1:
+        return [row[0] for row in rows]
+    return list(rows)
+
+
 def make_naive(dt: datetime) -> datetime:
     """
     Make a timezone-aware datetime naive by converting to UTC and removing tzinfo.
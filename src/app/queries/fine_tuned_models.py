@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional, Tuple, List
 from uuid import UUID
 
 from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.fine_tuned_model import FineTunedModel
@@ -25,22 +26,23 @@ async def get_existing_model(
     return result.scalar_one_or_none()
 
 
-async def create_model(
+async def create_models_bulk(
         db: AsyncSession,
-        job_id: UUID,
-        user_id: UUID,
-        name: str,
-        artifacts: Dict[str, Any]
-) -> FineTunedModel:
-    """Create a new fine-tuned model."""
-    model = FineTunedModel(
-        user_id=user_id,
-        fine_tuning_job_id=job_id,
-        name=name,
-        artifacts=artifacts
+        models: List[Dict[str, Any]]
+) -> List[UUID]:
+    """
+    Create many fine-tuned models with a single INSERT.
+
+    Models whose name already exists for the user are skipped.
+    Returns the IDs of the models that were created.
+    """
+    result = await db.execute(
+        pg_insert(FineTunedModel)
+        .values(models)
+        .on_conflict_do_nothing(constraint='uq_fine_tuned_model_user_id_name')
+        .returning(FineTunedModel.id)
     )
-    db.add(model)
-    return model
+    return list(result.scalars().all())
 
 
 async def get_model_by_name(
@@ -1,14 +1,15 @@
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, update, Select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, load_only
 
 from app.core.constants import FineTuningJobStatus
 from app.models.base_model import BaseModel
 from app.models.dataset import Dataset
+from app.models.fine_tuned_model import FineTunedModel
 from app.models.fine_tuning_job import FineTuningJob
 from app.models.fine_tuning_job_detail import FineTuningJobDetail
 from app.queries.common import make_naive, now_utc
@@ -145,13 +146,71 @@ async def get_jobs_for_status_update(
         List of jobs with their details loaded
 
     Note:
-        This includes both non-terminal jobs and recently completed jobs
+        This includes both non-terminal jobs and recently completed jobs.
+        Only the columns used by the status updater are loaded; other
+        columns are loaded on demand, or by later queries for the same jobs.
     """
     query = (
+        _jobs_for_status_update_query(non_terminal_statuses, recent_completed_cutoff)
+        .order_by(FineTuningJob.updated_at.desc())
+    )
+
+    result = await db.execute(query)
+    jobs = result.scalars().all()
+
+    return jobs
+
+
+async def stream_jobs_for_status_update(
+        db: AsyncSession,
+        non_terminal_statuses: List[FineTuningJobStatus],
+        recent_completed_cutoff: datetime,
+        batch_size: int = 1000
+) -> AsyncIterator[FineTuningJob]:
+    """
+    Stream jobs that need status updates, ordered by user.
+
+    Args:
+        db: Database session
+        non_terminal_statuses: List of statuses to include
+        recent_completed_cutoff: Cutoff time for recently completed jobs
+        batch_size: Number of rows to fetch from the database at a time
+
+    Yields:
+        Jobs with their details loaded; all jobs of a user are yielded together
+
+    Note:
+        Same jobs as `get_jobs_for_status_update`, but callers can start
+        working on a user's jobs before the rest have been loaded
+    """
+    query = (
+        _jobs_for_status_update_query(non_terminal_statuses, recent_completed_cutoff)
+        .order_by(FineTuningJob.user_id, FineTuningJob.updated_at.desc())
+        .execution_options(yield_per=batch_size)
+    )
+
+    result = await db.stream_scalars(query)
+    async for job in result:
+        yield job
+
+
+def _jobs_for_status_update_query(
+        non_terminal_statuses: List[FineTuningJobStatus],
+        recent_completed_cutoff: datetime
+) -> Select:
+    """Build the query for jobs that need status updates."""
+    return (
         select(FineTuningJob)
         .options(
-            selectinload(FineTuningJob.details),
-            selectinload(FineTuningJob.fine_tuned_model)
+            load_only(
+                FineTuningJob.id,
+                FineTuningJob.user_id,
+                FineTuningJob.name,
+                FineTuningJob.status,
+                FineTuningJob.current_step
+            ),
+            selectinload(FineTuningJob.details).load_only(FineTuningJobDetail.timestamps),
+            selectinload(FineTuningJob.fine_tuned_model).load_only(FineTunedModel.id)
         )
         .where(
             or_(
@@ -164,10 +223,40 @@ async def get_jobs_for_status_update(
                 )
             )
         )
-        .order_by(FineTuningJob.updated_at.desc())
     )
 
-    result = await db.execute(query)
-    jobs = result.scalars().all()
 
-    return jobs
+async def update_job_statuses_bulk(
+        db: AsyncSession,
+        status_changes: List[Dict[str, Any]]
+) -> None:
+    """
+    Update the status of many jobs at once.
+
+    Args:
+        db: Database session
+        status_changes: List of `{"id": ..., "status": ...}` dicts
+
+    Note:
+        This is sent as a single executemany UPDATE, keyed by job ID
+    """
+    if status_changes:
+        await db.execute(update(FineTuningJob), status_changes)
+
+
+async def update_job_timestamps_bulk(
+        db: AsyncSession,
+        timestamp_changes: List[Dict[str, Any]]
+) -> None:
+    """
+    Update the timestamps of many jobs at once.
+
+    Args:
+        db: Database session
+        timestamp_changes: List of `{"fine_tuning_job_id": ..., "timestamps": ...}` dicts
+
+    Note:
+        This is sent as a single executemany UPDATE, keyed by job ID
+    """
+    if timestamp_changes:
+        await db.execute(update(FineTuningJobDetail), timestamp_changes)
@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, update, cast, JSON, Text, Row
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.constants import FineTunedModelStatus
@@ -106,22 +107,33 @@ async def count_fine_tuned_models(
     return result.scalar_one()
 
 
-async def get_deleted_models(
+async def stream_deleted_model_weights(
         db: AsyncSession,
-        cutoff_date: datetime
-) -> List[FineTunedModel]:
+        cutoff_date: datetime,
+        batch_size: int = 500
+) -> AsyncIterator[Row]:
     """
-    Get recently deleted models that need weight cleanup.
+    Stream the weights of recently deleted models that need weight cleanup.
 
     Args:
         db: Database session
         cutoff_date: Only include models deleted after this date
+        batch_size: Number of rows to fetch from the database at a time
 
-    Returns:
-        List of deleted models with artifacts to clean up
+    Yields:
+        Rows with the model's `id`, and the `base_url` and `weight_files` from its artifacts
+
+    Note:
+        Rows are fetched in batches, so callers can start cleaning up models before the rest
+        have been loaded; only the artifacts needed for cleanup are loaded, and the models
+        are locked until the caller's transaction ends
     """
     query = (
-        select(FineTunedModel)
+        select(
+            FineTunedModel.id,
+            FineTunedModel.artifacts['base_url'].as_string().label('base_url'),
+            FineTunedModel.artifacts['weight_files'].label('weight_files')
+        )
         .where(
             and_(
                 FineTunedModel.status == FineTunedModelStatus.DELETED,
@@ -129,9 +141,42 @@ async def get_deleted_models(
             )
         )
         .order_by(FineTunedModel.updated_at.desc())
+        # Lock the models for this cleanup run, and skip those locked by other workers
+        .with_for_update(skip_locked=True)
+        .execution_options(yield_per=batch_size)
     )
 
-    result = await db.execute(query)
-    models = result.scalars().all()
+    result = await db.stream(query)
+    async for row in result:
+        yield row
+
+
+async def clear_model_weight_files(
+        db: AsyncSession,
+        model_ids: List[UUID]
+) -> None:
+    """
+    Empty the weight files list in the artifacts of many models at once.
+
+    Args:
+        db: Database session
+        model_ids: IDs of the models whose weights were cleaned up
 
-    return models
+    Note:
+        This is sent as a single UPDATE; `artifacts` is a JSON column, so it's cast to JSONB and back
+    """
+    if not model_ids:
+        return
+    await db.execute(
+        update(FineTunedModel)
+        .where(FineTunedModel.id.in_(model_ids))
+        .values(artifacts=cast(
+            func.jsonb_set(
+                cast(FineTunedModel.artifacts, JSONB),
+                cast(['weight_files'], ARRAY(Text)),
+                cast([], JSONB)
+            ),
+            JSON
+        ))
+        .execution_options(synchronize_session=False)
+    )
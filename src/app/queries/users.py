@@ -1,7 +1,7 @@
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
@@ -22,3 +22,24 @@ async def get_user_by_stripe_customer_id(db: AsyncSession, stripe_customer_id: s
     """Get a user by Stripe customer ID."""
     result = await db.execute(select(User).where(User.stripe_customer_id == stripe_customer_id))
     return result.scalar_one_or_none()
+
+
+async def create_user(
+        db: AsyncSession,
+        name: str,
+        email: str,
+        auth0_user_id: str,
+        email_verified: bool
+) -> User:
+    """Insert a new user and return it with its server-generated fields loaded."""
+    result = await db.execute(
+        insert(User)
+        .values(
+            email=email,
+            name=name,
+            auth0_user_id=auth0_user_id,
+            email_verified=email_verified
+        )
+        .returning(User)
+    )
+    return result.scalar_one()
@@ -1,5 +1,5 @@
 from authlib.integrations.starlette_client import OAuth
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, Response
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
@@ -43,12 +43,13 @@ async def login(request: Request) -> RedirectResponse:
 @router.get("/auth0/callback")
 async def auth0_callback(
         request: Request,
+        background_tasks: BackgroundTasks,
         db: AsyncSession = Depends(get_db)
 ) -> RedirectResponse:
     """Handle Auth0 callback after successful authentication."""
     try:
         # Process callback and get user
-        session_data, _ = await auth0_service.handle_callback(request, db)
+        session_data, _ = await auth0_service.handle_callback(request, db, background_tasks)
 
         # Store user information in session
         request.session['user'] = session_data
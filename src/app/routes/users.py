@@ -24,7 +24,7 @@ async def get_current_user_info(
 ) -> UserResponse:
     """Get current user's information."""
     logger.info(f"Retrieved information for user: {current_user.id}")
-    return UserResponse.from_orm(current_user)
+    return UserResponse.model_validate(current_user)
 
 
 @router.patch("/users/me", response_model=UserResponse)
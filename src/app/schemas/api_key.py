@@ -5,11 +5,12 @@ from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 from app.core.constants import ApiKeyStatus
 from app.core.exceptions import BadRequestError
+from app.queries.common import now_utc
 from app.schemas.common import NameField, DateTime
 
 
 def _expiration_must_be_future(v: datetime) -> datetime:
-    if v.astimezone(timezone.utc) <= datetime.utcnow().astimezone(timezone.utc):
+    if v.astimezone(timezone.utc) <= now_utc():
         raise BadRequestError('Expiration date must be in the future')
     return v
 
@@ -14,6 +14,15 @@ class Pagination(BaseModel):
     items_per_page: int
 
 
+class PaginationWithoutTotal(BaseModel):
+    """
+    Pagination information for queries that skip counting their rows. Internal, not used in API responses.
+    """
+    current_page: int
+    items_per_page: int
+    has_next: bool
+
+
 NameField = partial(Field,
                     min_length=1, max_length=255,
                     pattern="^[a-z0-9-]+$")
@@ -54,7 +54,7 @@ async def create_api_key(db: AsyncSession, user_id: UUID, api_key: ApiKeyCreate)
 
     logger.info(f"Created new API key for user: {user_id}, prefix: {key_prefix}")
     return ApiKeyWithSecretResponse(
-        **ApiKeyResponse.from_orm(db_api_key).dict(),
+        **ApiKeyResponse.model_validate(db_api_key).model_dump(),
         secret=key
     )
 
@@ -81,7 +81,7 @@ async def get_api_keys(
     )
 
     # Create response objects
-    api_key_responses = [ApiKeyResponse.from_orm(key) for key in api_keys]
+    api_key_responses = [ApiKeyResponse.model_validate(key) for key in api_keys]
 
     logger.info(f"Retrieved API keys for user: {user_id}, page: {page}")
     return api_key_responses, pagination
@@ -94,7 +94,7 @@ async def get_api_key(db: AsyncSession, user_id: UUID, key_name: str) -> ApiKeyR
         raise ApiKeyNotFoundError(f"API key not found: {key_name} for user: {user_id}", logger)
 
     logger.info(f"Retrieved API key: {key_name} for user: {user_id}")
-    return ApiKeyResponse.from_orm(api_key)
+    return ApiKeyResponse.model_validate(api_key)
 
 
 async def update_api_key(db: AsyncSession, user_id: UUID, key_name: str,
@@ -117,7 +117,7 @@ async def update_api_key(db: AsyncSession, user_id: UUID, key_name: str,
         api_key_update.expires_at = expires_at
 
     # Update the API key fields
-    update_data = api_key_update.dict(exclude_unset=True)
+    update_data = api_key_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_api_key, field, value)
 
@@ -128,7 +128,7 @@ async def update_api_key(db: AsyncSession, user_id: UUID, key_name: str,
     db_api_key.expires_at = db_api_key.expires_at.replace(tzinfo=timezone.utc)
 
     logger.info(f"Updated API key: {key_name} for user: {user_id}")
-    return ApiKeyResponse.from_orm(db_api_key)
+    return ApiKeyResponse.model_validate(db_api_key)
 
 
 async def revoke_api_key(db: AsyncSession, user_id: UUID, key_name: str) -> ApiKeyResponse:
@@ -142,4 +142,4 @@ async def revoke_api_key(db: AsyncSession, user_id: UUID, key_name: str) -> ApiK
     await db.refresh(db_api_key)
 
     logger.info(f"Revoked API key: {key_name} for user: {user_id}")
-    return ApiKeyResponse.from_orm(db_api_key)
+    return ApiKeyResponse.model_validate(db_api_key)
@@ -1,6 +1,7 @@
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from urllib.parse import quote_plus, urlencode
 
+from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
@@ -10,6 +11,7 @@ from app.core.utils import setup_logger
 from app.models.user import User
 from app.queries import users as user_queries
 from app.services.billing import add_credits_to_user
+from app.services.user import create_stripe_customer_task
 
 logger = setup_logger(__name__)
 
@@ -67,7 +69,8 @@ class Auth0Service:
     async def handle_callback(
             self,
             request: Request,
-            db: AsyncSession
+            db: AsyncSession,
+            background_tasks: Optional[BackgroundTasks] = None
     ) -> Tuple[Dict[str, str], User]:
         """
         Handle Auth0 callback and create/update user.
@@ -75,6 +78,7 @@ class Auth0Service:
         Args:
             request: The incoming request
             db: Database session
+            background_tasks: Tasks to run after the response is sent, if any
 
         Returns:
             Tuple of session data and user object
@@ -98,7 +102,7 @@ class Auth0Service:
 
         # Get or create user
         user = await self._get_or_create_user(
-            db, name, email, auth0_user_id, email_verified
+            db, name, email, auth0_user_id, email_verified, background_tasks
         )
 
         # Create session data
@@ -117,7 +121,8 @@ class Auth0Service:
             name: str,
             email: str,
             auth0_user_id: str,
-            email_verified: bool
+            email_verified: bool,
+            background_tasks: Optional[BackgroundTasks] = None
     ) -> User:
         """
         Get existing user or create new one.
@@ -128,6 +133,8 @@ class Auth0Service:
             email: User's email
             auth0_user_id: Auth0 user ID
             email_verified: Whether email is verified
+            background_tasks: Tasks to run after the response is sent; a new user's
+                Stripe customer is created there, instead of blocking the signup
 
         Returns:
             User object
@@ -163,6 +170,10 @@ class Auth0Service:
                         BillingTransactionType.NEW_USER_CREDIT
                     )
 
+                # Create the Stripe customer after the response is sent
+                if background_tasks is not None:
+                    background_tasks.add_task(create_stripe_customer_task, user.id)
+
                 logger.info(f"Created new user: {email}")
 
             return user
@@ -91,11 +91,13 @@ async def add_manual_credits(
             transaction_type=BillingTransactionType.MANUAL_ADJUSTMENT
         )
         db.add(credit_record)
+        # The flush loads the server-generated fields through RETURNING,
+        # so there's no need to refresh the record after the commit
+        await db.flush()
         await db.commit()
-        await db.refresh(credit_record)
 
         logger.info(f"Added {request.amount} credits to user: {user.id}")
-        return CreditHistoryResponse.from_orm(credit_record)
+        return CreditHistoryResponse.model_validate(credit_record)
     except IntegrityError:
         await db.rollback()
         raise BadRequestError(f"Transaction already exists: {request.transaction_id}, "
@@ -130,7 +132,7 @@ async def deduct_credits(
         BillingTransactionType.FINE_TUNING_JOB
     )
     if existing_credit:
-        return CreditHistoryResponse.from_orm(existing_credit)
+        return CreditHistoryResponse.model_validate(existing_credit)
 
     # Calculate required credits
     required_credits = await calculate_required_credits(
@@ -175,7 +177,7 @@ async def process_credit_deduction(
     )
     # If we did, return success response with existing record
     if credit_record:
-        return CreditHistoryResponse.from_orm(credit_record)
+        return CreditHistoryResponse.model_validate(credit_record)
 
     # Record deduction
     credit_record = BillingCredit(
@@ -201,7 +203,7 @@ async def process_credit_deduction(
     await db.refresh(credit_record)
 
     logger.info(f"Deducted {required_credits} credits for user: {user.id}, job: {job.id}")
-    return CreditHistoryResponse.from_orm(credit_record)
+    return CreditHistoryResponse.model_validate(credit_record)
 
 
 async def handle_insufficient_credits(
@@ -324,7 +326,7 @@ async def get_credit_history(
 
     # Convert to response objects
     credit_responses = [
-        CreditHistoryResponse.from_orm(credit)
+        CreditHistoryResponse.model_validate(credit)
         for credit in credits
     ]
 
@@ -547,7 +549,7 @@ async def add_credits_to_user(
             f"(transaction: {transaction_id}, type: {transaction_type})"
         )
 
-        return CreditHistoryResponse.from_orm(credit_record)
+        return CreditHistoryResponse.model_validate(credit_record)
 
     except Exception as e:
         await db.rollback()
@@ -57,7 +57,7 @@ async def create_dataset(db: AsyncSession, user_id: UUID, dataset: DatasetCreate
         await db.refresh(db_dataset)
 
         logger.info(f"Created dataset: {db_dataset.id} for user: {user_id}")
-        return DatasetResponse.from_orm(db_dataset)
+        return DatasetResponse.model_validate(db_dataset)
 
     except SQLAlchemyError as e:
         # If there's an SQL error, delete the uploaded file
@@ -88,7 +88,7 @@ async def get_datasets(
     )
 
     # Create response objects
-    dataset_responses = [DatasetResponse.from_orm(dataset) for dataset in datasets]
+    dataset_responses = [DatasetResponse.model_validate(dataset) for dataset in datasets]
 
     logger.info(f"Retrieved datasets for user: {user_id}, page: {page}")
     return dataset_responses, pagination
@@ -101,7 +101,7 @@ async def get_dataset(db: AsyncSession, user_id: UUID, dataset_name: str) -> Dat
         raise DatasetNotFoundError(f"Dataset not found: {dataset_name} for user: {user_id}", logger)
 
     logger.info(f"Retrieved dataset: {dataset_name} for user: {user_id}")
-    return DatasetResponse.from_orm(dataset)
+    return DatasetResponse.model_validate(dataset)
 
 
 async def update_dataset(db: AsyncSession, user_id: UUID, dataset_name: str,
@@ -117,7 +117,7 @@ async def update_dataset(db: AsyncSession, user_id: UUID, dataset_name: str,
                                         f"exists for user {user_id}", logger)
 
     # Update the dataset fields
-    update_data = dataset_update.dict(exclude_unset=True)
+    update_data = dataset_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_dataset, field, value)
 
@@ -125,7 +125,7 @@ async def update_dataset(db: AsyncSession, user_id: UUID, dataset_name: str,
     await db.refresh(db_dataset)
 
     logger.info(f"Updated dataset: {dataset_name} for user: {user_id}")
-    return DatasetResponse.from_orm(db_dataset)
+    return DatasetResponse.model_validate(db_dataset)
 
 
 async def delete_dataset(db: AsyncSession, user_id: UUID, dataset_name: str) -> None:
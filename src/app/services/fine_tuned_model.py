@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,8 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config_manager import config
 from app.core.exceptions import FineTunedModelNotFoundError
 from app.core.utils import setup_logger
+from app.models.fine_tuning_job import FineTuningJob
 from app.queries import fine_tuned_models as ft_models_queries
-from app.queries import fine_tuning as ft_jobs_queries
 from app.schemas.common import Pagination
 from app.schemas.model import FineTunedModelResponse
 
@@ -64,55 +64,32 @@ async def get_fine_tuned_model(
     return FineTunedModelResponse(**model_dict)
 
 
-async def create_fine_tuned_model(
+async def create_fine_tuned_models_bulk(
         db: AsyncSession,
-        job_id: UUID,
-        user_id: UUID,
-        artifacts: Dict[str, Any]
-) -> bool:
+        model_requests: List[Tuple[FineTuningJob, Dict[str, Any]]]
+) -> List[UUID]:
     """
-    Create a fine-tuned model record from job artifacts.
+    Create fine-tuned models for many jobs with a single INSERT; the caller commits.
 
     Args:
         db: Database session
-        job_id: Fine-tuning job ID
-        user_id: User ID
-        artifacts: Model artifacts (weights, configs, etc.)
+        model_requests: Jobs without a model, each with its model artifacts
 
     Returns:
-        True if model was created, False if skipped
-
-    Note:
-        This is idempotent - it won't create duplicate models
-        for the same job
+        IDs of the created models; jobs whose model already exists are skipped
     """
-    # Check if the job exists and belongs to the user
-    job = await ft_jobs_queries.get_job_by_id(db, job_id, user_id)
-    if not job:
-        logger.warning(f"Cannot create model: Job {job_id} not found for user {user_id}")
-        return False
-
-    # Check if a model already exists for this job
-    existing_model = await ft_models_queries.get_existing_model(db, job_id, user_id)
-    if existing_model:
-        logger.warning(f"Model already exists for job {job_id}: {existing_model.id}")
-        return True
-
-    try:
-        # Create new model
-        model = await ft_models_queries.create_model(
-            db,
-            job_id,
-            user_id,
-            f"{job.name}_model",
-            artifacts
-        )
-        await db.commit()
-
-        logger.info(f"Created fine-tuned model for job {job_id}: {model.id}")
-        return True
-
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to create model for job {job_id}: {str(e)}")
-        return False
+    if not model_requests:
+        return []
+
+    model_ids = await ft_models_queries.create_models_bulk(db, [
+        {
+            "user_id": job.user_id,
+            "fine_tuning_job_id": job.id,
+            "name": f"{job.name}_model",
+            "artifacts": artifacts
+        }
+        for job, artifacts in model_requests
+    ])
+
+    logger.info(f"Created {len(model_ids)} fine-tuned models for {len(model_requests)} jobs")
+    return model_ids
@@ -255,9 +255,14 @@ async def delete_fine_tuning_job(
 async def update_job_progress(
         db: AsyncSession,
         job: FineTuningJob,
-        progress: dict
+        progress: dict,
+        commit: bool = True
 ) -> bool:
-    """Update job progress information."""
+    """
+    Update job progress information.
+
+    Pass `commit=False` to leave committing to the caller, ex. when batching many updates.
+    """
 
     # Ignore outdated progress updates
     if progress['current_step'] <= (job.current_step or -1):
@@ -270,12 +275,14 @@ async def update_job_progress(
         job.current_epoch = progress['current_epoch']
         job.total_epochs = progress['total_epochs']
 
-        await db.commit()
-        logger.info(f"Updated progress for job: {job.id}, step: {progress['current_step']}")
+        if commit:
+            await db.commit()
+        logger.debug("Updated progress for job: %s, step: %s", job.id, progress['current_step'])
         return True
 
     except Exception as e:
-        await db.rollback()
+        if commit:
+            await db.rollback()
         logger.error(f"Failed to update job progress: {str(e)}")
         return False
 
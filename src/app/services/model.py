@@ -31,7 +31,7 @@ async def get_base_models(
     )
 
     # Create response objects
-    model_responses = [BaseModelResponse.from_orm(model) for model in models]
+    model_responses = [BaseModelResponse.model_validate(model) for model in models]
 
     logger.info(f"Retrieved {len(model_responses)} base models, page: {page}")
     return model_responses, pagination
@@ -44,4 +44,4 @@ async def get_base_model(db: AsyncSession, model_name: str) -> BaseModelResponse
         raise BaseModelNotFoundError(f"Base model not found: {model_name}", logger)
 
     logger.info(f"Retrieved base model: {model_name}")
-    return BaseModelResponse.from_orm(model)
+    return BaseModelResponse.model_validate(model)
@@ -1,9 +1,12 @@
+from typing import Optional
 from uuid import UUID
 
+from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config_manager import config
 from app.core.constants import UserStatus, BillingTransactionType
+from app.core.database import AsyncSessionLocal
 from app.core.exceptions import UserNotFoundError
 from app.core.stripe_client import create_stripe_customer
 from app.core.utils import setup_logger
@@ -15,6 +18,9 @@ from app.services.billing import add_credits_to_user
 # Set up logger
 logger = setup_logger(__name__, add_stdout=config.log_stdout, log_level=config.log_level)
 
+# Credits given to every new user
+NEW_USER_CREDITS = float(config.new_user_credits or 0)
+
 
 async def update_user(db: AsyncSession, user_id: UUID, user_update: UserUpdate) -> UserResponse:
     """Update a user's information."""
@@ -25,8 +31,13 @@ async def update_user(db: AsyncSession, user_id: UUID, user_update: UserUpdate)
     if not user:
         raise UserNotFoundError(f"User with ID {user_id} not found", logger)
 
+    # Nothing to update, skip the database round trip
+    update_data = user_update.model_dump(exclude_unset=True)
+    if not update_data:
+        logger.info(f"No changes requested for user: {user_id}")
+        return UserResponse.model_validate(user)
+
     # Update the user's information
-    update_data = user_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(user, field, value)
 
@@ -34,7 +45,7 @@ async def update_user(db: AsyncSession, user_id: UUID, user_update: UserUpdate)
     await db.refresh(user)
 
     logger.info(f"Successfully updated user: {user_id}")
-    return UserResponse.from_orm(user)
+    return UserResponse.model_validate(user)
 
 
 async def deactivate_user(db: AsyncSession, user_id: UUID) -> None:
@@ -54,30 +65,31 @@ async def deactivate_user(db: AsyncSession, user_id: UUID) -> None:
 
 
 async def create_user(db: AsyncSession, name: str, email: str,
-                      auth0_user_id: str, email_verified: bool) -> User:
-    """Create a new user."""
+                      auth0_user_id: str, email_verified: bool,
+                      background_tasks: Optional[BackgroundTasks] = None) -> User:
+    """
+    Create a new user.
+
+    If `background_tasks` is given, the Stripe customer is created after the
+    response is sent, instead of blocking the signup on the Stripe API.
+    """
     try:
-        # Create the new user
-        db_user = User(
-            email=email,
-            name=name,
-            auth0_user_id=auth0_user_id,
-            email_verified=email_verified
-        )
-        db.add(db_user)
+        # Create the new user; RETURNING loads the server defaults in the same round trip
+        db_user = await user_queries.create_user(db, name, email, auth0_user_id, email_verified)
         await db.commit()
-        await db.refresh(db_user)
 
         # Add new user credits
-        free_credits = float(config.new_user_credits)
-        if config.new_user_credits:
+        if NEW_USER_CREDITS > 0:
             await add_credits_to_user(
-                db, db_user.id, free_credits,
+                db, db_user.id, NEW_USER_CREDITS,
                 "NEW_USER_CREDIT", BillingTransactionType.NEW_USER_CREDIT
             )
 
         # Create a Stripe customer
-        await create_stripe_customer(db, db_user)
+        if background_tasks is not None:
+            background_tasks.add_task(create_stripe_customer_task, db_user.id)
+        else:
+            await create_stripe_customer(db, db_user)
 
         logger.info(f"Successfully created new user with ID: {db_user.id}")
         return db_user
@@ -85,3 +97,18 @@ async def create_user(db: AsyncSession, name: str, email: str,
     except Exception as e:
         await db.rollback()
         raise e
+
+
+async def create_stripe_customer_task(user_id: UUID) -> None:
+    """
+    Create a Stripe customer for a user outside the request scope.
+
+    Opens its own database session, since the request session is closed by the time this runs.
+    If this fails, `get_current_active_user` creates the customer on the user's next request.
+    """
+    async with AsyncSessionLocal() as db:
+        user = await user_queries.get_user_by_id(db, user_id)
+        if not user:
+            logger.warning(f"Cannot create Stripe customer: user {user_id} not found")
+            return
+        await create_stripe_customer(db, user)
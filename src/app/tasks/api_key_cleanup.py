@@ -1,8 +1,8 @@
 from typing import Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import engine
 from app.core.utils import setup_logger
 from app.queries import api_keys as api_key_queries
 
@@ -10,15 +10,17 @@ logger = setup_logger(__name__)
 
 
 async def cleanup_expired_api_keys(db: Optional[AsyncSession] = None) -> None:
-    """Wrapper to _cleanup_expired_api_keys that handles database session."""
+    """Wrapper to _cleanup_expired_api_keys that handles database connection."""
     if db is None:
-        async with AsyncSessionLocal() as db:
-            await _cleanup_expired_api_keys(db)
+        # This is a single bulk UPDATE, so skip the ORM session
+        # and run it directly on a pooled engine connection
+        async with engine.connect() as conn:
+            await _cleanup_expired_api_keys(conn)
     else:
         await _cleanup_expired_api_keys(db)
 
 
-async def _cleanup_expired_api_keys(db: AsyncSession) -> None:
+async def _cleanup_expired_api_keys(db: AsyncSession | AsyncConnection) -> None:
     """Mark expired API keys as EXPIRED in a single transaction."""
     try:
         # Update expired keys to EXPIRED status
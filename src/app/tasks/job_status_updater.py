@@ -1,17 +1,21 @@
+import asyncio
+from collections import defaultdict
 from datetime import timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config_manager import config
 from app.core.constants import FineTuningJobStatus
 from app.core.database import AsyncSessionLocal
-from app.core.scheduler_client import fetch_job_details
+from app.core.scheduler_client import fetch_job_details, fetch_job_details_bulk
 from app.core.utils import setup_logger
 from app.models.fine_tuning_job import FineTuningJob
 from app.queries import fine_tuning as ft_queries
 from app.queries.common import now_utc
-from app.services.fine_tuned_model import create_fine_tuned_model
+from app.services.fine_tuned_model import create_fine_tuned_models_bulk
 from app.services.fine_tuning import update_job_progress
 
 logger = setup_logger(__name__)
@@ -23,6 +27,20 @@ STATUS_MAPPING = {
     "DETACHED_VM": FineTuningJobStatus.QUEUED,
 }
 
+# Resolve any scheduler status to our internal status with a single lookup
+RESOLVED_STATUS = {**{status.value: status for status in FineTuningJobStatus}, **STATUS_MAPPING}
+
+# Statuses of jobs that need status updates, besides recently completed ones
+NON_TERMINAL_STATUSES = [
+    FineTuningJobStatus.NEW,
+    FineTuningJobStatus.QUEUED,
+    FineTuningJobStatus.RUNNING,
+    FineTuningJobStatus.STOPPING
+]
+
+# Map scheduler events to our timestamp keys, precomputed for `_update_job_timestamps`
+TIMESTAMP_MAPPING = {event.upper(): status.lower() for event, status in STATUS_MAPPING.items()}
+
 
 async def update_job_statuses(db: Optional[AsyncSession] = None) -> None:
     """Wrapper to _update_job_statuses that handles database session."""
@@ -36,18 +54,27 @@ async def update_job_statuses(db: Optional[AsyncSession] = None) -> None:
 async def _update_job_statuses(db: AsyncSession) -> None:
     """Update the status of all non-terminal jobs."""
     try:
-        # Get jobs that need updates
-        jobs = await _get_jobs_for_update(db)
+        if config.scheduler_bulk_job_details:
+            # Get all jobs that need updates, then their updates with a single scheduler request
+            jobs = await _get_jobs_for_update(db)
+            updates_by_user = await _fetch_jobs_bulk(_group_jobs_by_user(jobs), jobs) if jobs else {}
+        else:
+            # Get each user's updates from scheduler as soon as their jobs are loaded
+            jobs = []
+            updates_by_user = await _fetch_job_groups(_stream_job_groups(db, jobs))
+
         if not jobs:
             logger.info("No jobs found for status update")
             return
 
-        # Group jobs by user for scheduler API
-        jobs_by_user = _group_jobs_by_user(jobs)
+        # Apply updates one group at a time, since the session isn't safe for concurrent use,
+        # and commit them all at once; each group gets a savepoint, so one user's failure
+        # doesn't roll back everyone else's changes
+        job_maps = _map_jobs_by_user(jobs)
+        for user_id, job_updates in updates_by_user.items():
+            await _update_job_group(db, user_id, job_updates, job_maps[user_id])
 
-        # Update each group of jobs
-        for user_id, job_ids in jobs_by_user.items():
-            await _update_job_group(db, user_id, job_ids)
+        await db.commit()
 
     except Exception as e:
         await db.rollback()
@@ -56,144 +83,257 @@ async def _update_job_statuses(db: AsyncSession) -> None:
 
 async def _get_jobs_for_update(db: AsyncSession) -> List[FineTuningJob]:
     """Get jobs that need status updates."""
-    non_terminal_statuses = [
-        FineTuningJobStatus.NEW,
-        FineTuningJobStatus.QUEUED,
-        FineTuningJobStatus.RUNNING,
-        FineTuningJobStatus.STOPPING
-    ]
-
     recent_completed_cutoff = now_utc() - timedelta(minutes=10)
 
     return await ft_queries.get_jobs_for_status_update(
         db,
-        non_terminal_statuses,
+        NON_TERMINAL_STATUSES,
         recent_completed_cutoff
     )
 
 
 def _group_jobs_by_user(jobs: List[FineTuningJob]) -> Dict[UUID, List[UUID]]:
     """Group jobs by user ID for efficient scheduler API calls."""
-    jobs_by_user = {}
+    jobs_by_user = defaultdict(list)
     for job in jobs:
-        if job.user_id not in jobs_by_user:
-            jobs_by_user[job.user_id] = []
         jobs_by_user[job.user_id].append(job.id)
     return jobs_by_user
 
 
-async def _update_job_group(
+def _map_jobs_by_user(jobs: List[FineTuningJob]) -> Dict[UUID, Dict[str, FineTuningJob]]:
+    """Map each user's jobs by job ID, to look up the jobs for scheduler updates in memory."""
+    job_maps = defaultdict(dict)
+    for job in jobs:
+        job_maps[job.user_id][str(job.id)] = job
+    return job_maps
+
+
+async def _stream_job_groups(
         db: AsyncSession,
+        jobs: List[FineTuningJob]
+) -> AsyncIterator[Tuple[UUID, List[UUID]]]:
+    """Stream jobs that need status updates, yielding each user's job IDs once all are loaded."""
+    user_id = None
+    job_ids = []
+
+    # Jobs arrive ordered by user; collect them into `jobs` for the caller as they load
+    async for job in ft_queries.stream_jobs_for_status_update(
+            db,
+            NON_TERMINAL_STATUSES,
+            now_utc() - timedelta(minutes=10)
+    ):
+        jobs.append(job)
+        if job_ids and job.user_id != user_id:
+            yield user_id, job_ids
+            job_ids = []
+        user_id = job.user_id
+        job_ids.append(job.id)
+
+    if job_ids:
+        yield user_id, job_ids
+
+
+async def _fetch_jobs_bulk(
+        jobs_by_user: Dict[UUID, List[UUID]],
+        jobs: List[FineTuningJob]
+) -> Dict[UUID, List[Dict[str, Any]]]:
+    """Get updates for the jobs of all users with a single scheduler request."""
+    job_updates = await fetch_job_details_bulk(jobs_by_user)
+
+    # Group updates by the owner of each job we already loaded
+    job_owners = {str(job.id): job.user_id for job in jobs}
+    updates_by_user = {}
+    for update in job_updates:
+        user_id = job_owners.get(update['job_id'])
+        if not user_id:
+            logger.warning(f"Got update for unknown job: {update['job_id']}")
+            continue
+        updates_by_user.setdefault(user_id, []).append(update)
+    return updates_by_user
+
+
+async def _fetch_job_groups(
+        job_groups: AsyncIterator[Tuple[UUID, List[UUID]]]
+) -> Dict[UUID, List[Dict[str, Any]]]:
+    """Get updates for each group of jobs from scheduler concurrently, as groups arrive."""
+    # Groups are independent and most of the time is spent waiting on the scheduler API
+    semaphore = asyncio.Semaphore(int(config.scheduler_poll_concurrency))
+    tasks = {}
+    try:
+        async for user_id, job_ids in job_groups:
+            tasks[user_id] = asyncio.create_task(_fetch_job_group(semaphore, user_id, job_ids))
+    except Exception:
+        # Don't leave requests running if loading the jobs fails
+        for task in tasks.values():
+            task.cancel()
+        raise
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    updates_by_user = {}
+    for user_id, job_updates in zip(tasks, results):
+        if isinstance(job_updates, Exception):
+            logger.error(f"Failed to fetch jobs for user {user_id}: {str(job_updates)}")
+            continue
+        updates_by_user[user_id] = job_updates
+    return updates_by_user
+
+
+async def _fetch_job_group(
+        semaphore: asyncio.Semaphore,
         user_id: UUID,
         job_ids: List[UUID]
-) -> None:
-    """Update a group of jobs for a single user."""
-    try:
-        # Get updates from scheduler
-        job_updates = await fetch_job_details(user_id, job_ids)
+) -> List[Dict[str, Any]]:
+    """Get updates for a group of jobs from scheduler, limited by the semaphore."""
+    async with semaphore:
+        return await fetch_job_details(user_id, job_ids)
 
-        # Process each job update
-        for update in job_updates:
-            await _process_job_update(db, update, user_id)
 
-        await db.commit()
-        logger.info(f"Updated {len(job_updates)} jobs for user {user_id}")
+async def _update_job_group(
+        db: AsyncSession,
+        user_id: UUID,
+        job_updates: List[Dict[str, Any]],
+        job_map: Dict[str, FineTuningJob]
+) -> None:
+    """
+    Update a group of jobs for a single user, within a savepoint; the caller commits.
+
+    Jobs are looked up in `job_map`, the user's loaded jobs by ID, instead of querying for each update.
+    """
+    try:
+        async with db.begin_nested():
+            # Process each job update
+            status_changes = []
+            timestamp_changes = []
+            model_requests = []
+            for update in job_updates:
+                await _process_job_update(
+                    db, update, user_id, job_map, status_changes, timestamp_changes, model_requests
+                )
+
+            await _write_job_changes(db, status_changes, timestamp_changes)
+            await create_fine_tuned_models_bulk(db, model_requests)
+
+        # One summary line per user; per-job details are logged at debug level
+        logger.info("Updated %d jobs for user %s: %d status changes, %d timestamp changes",
+                    len(job_updates), user_id, len(status_changes), len(timestamp_changes))
 
     except Exception as e:
-        await db.rollback()
         logger.error(f"Failed to update jobs for user {user_id}: {str(e)}")
 
 
+async def _write_job_changes(
+        db: AsyncSession,
+        status_changes: List[Dict[str, Any]],
+        timestamp_changes: List[Dict[str, Any]]
+) -> None:
+    """Write job status and timestamp changes with one bulk UPDATE per table."""
+    await ft_queries.update_job_statuses_bulk(db, status_changes)
+    await ft_queries.update_job_timestamps_bulk(db, timestamp_changes)
+
+
 async def _process_job_update(
         db: AsyncSession,
         update: Dict[str, Any],
-        user_id: UUID
+        user_id: UUID,
+        job_map: Dict[str, FineTuningJob],
+        status_changes: List[Dict[str, Any]],
+        timestamp_changes: List[Dict[str, Any]],
+        model_requests: List[Tuple[FineTuningJob, Dict[str, Any]]]
 ) -> None:
-    """Process a single job update from the scheduler."""
+    """
+    Process a single job update from the scheduler.
+
+    Status and timestamp changes are appended to `status_changes` and `timestamp_changes`,
+    to be written in bulk by `_write_job_changes`, instead of flushing each job separately;
+    the same goes for fine-tuned models to create, in `model_requests`.
+    """
     job_id = UUID(update['job_id'])
-    job = await ft_queries.get_job_by_id(db, job_id, user_id)
+    job = job_map.get(update['job_id'])
     if not job:
         logger.warning(f"Job not found for update: {job_id}, user: {user_id}")
         return
 
-    # Update job status
-    new_status = STATUS_MAPPING.get(update['status']) or update['status']
+    # Update job status; keep the loaded job in sync without marking it dirty
+    new_status = RESOLVED_STATUS.get(update['status'], update['status'])
     if job.status != new_status:
-        job.status = new_status
-        logger.info(f"Updated status for job {job_id} to {new_status}")
-
-    # Update timestamps
-    await _update_job_timestamps(job, update['timestamps'])
+        status_changes.append({"id": job.id, "status": new_status})
+        set_committed_value(job, 'status', new_status)
+        logger.debug("Updated status for job %s to %s", job_id, new_status)
 
-    # Update progress
-    await _update_job_steps(db, job, update['artifacts'])
+    # Update timestamps; the bulk write persists them, so no need for `flag_modified`
+    if await _update_job_timestamps(job, update['timestamps']):
+        timestamp_changes.append({"fine_tuning_job_id": job.id, "timestamps": job.details.timestamps})
 
-    # Create fine-tuned model if needed
-    await _check_create_model(db, job_id, user_id, update['artifacts'])
+    # Update progress and create fine-tuned model if needed
+    await _process_artifacts(db, job, update['artifacts'], model_requests)
 
 
 async def _update_job_timestamps(
         job: Any,
         timestamps: Dict[str, str]
-) -> None:
-    """Update job timestamps from scheduler data."""
-    job_timestamps = job.details.timestamps.copy()
+) -> bool:
+    """Update job timestamps in place from scheduler data; return whether any changed."""
+    job_timestamps = job.details.timestamps
+    changed = False
 
     for event, timestamp in timestamps.items():
         # Map scheduler status to API status if needed
-        if event.upper() in STATUS_MAPPING:
-            if timestamp:  # Only update if we have a timestamp
-                mapped_status = STATUS_MAPPING[event.upper()].lower()
-                job_timestamps[mapped_status] = timestamp
+        key = TIMESTAMP_MAPPING.get(event.upper())
+        if key is not None:
+            if not timestamp:  # Only update if we have a timestamp
+                continue
         else:
             # Direct update for unmapped statuses
-            job_timestamps[event.lower()] = timestamp
+            key = event.lower()
+
+        if job_timestamps.get(key) != timestamp:
+            job_timestamps[key] = timestamp
+            changed = True
 
-    job.details.timestamps = job_timestamps
+    return changed
 
 
-async def _update_job_steps(
+async def _process_artifacts(
         db: AsyncSession,
         job: FineTuningJob,
-        artifacts: Dict[str, Any]
+        artifacts: Dict[str, Any],
+        model_requests: List[Tuple[FineTuningJob, Dict[str, Any]]]
 ) -> None:
-    """Update job progress from artifacts."""
+    """
+    Update job progress from artifacts, and queue fine-tuned model creation, in a single pass over the logs.
+
+    Models are appended to `model_requests`, to be created in bulk with `create_fine_tuned_models_bulk`.
+    """
     if not artifacts:
         return
 
-    job_logs = artifacts.get('job_logger', [])
-    max_step = 0
-    max_epoch = 0
-    num_steps = 0
-    num_epochs = 0
-
-    for log in job_logs:
-        if log.get('operation') == 'step':
-            max_step = max(max_step, log['data']['step_num'])
-            max_epoch = max(max_epoch, log['data']['epoch_num'])
-            num_steps = log['data']['step_len']
-            num_epochs = log['data']['epoch_len']
-
-    if job.current_step is None or max_step > job.current_step:
+    # Weights are only needed until the fine-tuned model exists
+    need_weights = job.fine_tuned_model is None
+    latest_step = None
+    weights_data = None
+
+    # Scan newest first; the scheduler appends logs, so the first step record is the latest
+    for log in reversed(artifacts.get('job_logger', [])):
+        operation = log.get('operation')
+        if operation == 'step' and latest_step is None:
+            latest_step = log['data']
+            if not need_weights:
+                break
+        elif operation == 'weights' and need_weights:
+            weights_data = log['data']  # Ends up with the oldest record
+
+    # Update progress; out of order steps are ignored by `update_job_progress`
+    step_data = latest_step or {}
+    current_step = step_data.get('step_num', 0)
+    if job.current_step is None or current_step > job.current_step:
         progress = {
-            "current_step": max_step,
-            "total_steps": num_steps,
-            "current_epoch": max_epoch,
-            "total_epochs": num_epochs,
+            "current_step": current_step,
+            "total_steps": step_data.get('step_len', 0),
+            "current_epoch": step_data.get('epoch_num', 0),
+            "total_epochs": step_data.get('epoch_len', 0),
         }
-        await update_job_progress(db, job, progress)
-
-
-async def _check_create_model(
-        db: AsyncSession,
-        job_id: UUID,
-        user_id: UUID,
-        artifacts: Dict[str, Any]
-) -> None:
-    """Check and create fine-tuned model if weights are available."""
-    if not artifacts:
-        return
+        await update_job_progress(db, job, progress, commit=False)
 
-    for log in artifacts.get('job_logger', []):
-        if log.get('operation') == 'weights':
-            await create_fine_tuned_model(db, job_id, user_id, log['data'])
+    # Queue fine-tuned model creation from the oldest weights record; a job has a single model
+    if weights_data is not None:
+        model_requests.append((job, weights_data))
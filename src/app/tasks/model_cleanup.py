@@ -1,17 +1,26 @@
+import asyncio
 from datetime import timedelta
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
 
 from gcloud.aio.storage import Storage
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import AsyncSessionLocal
+from app.core.storage import get_storage
 from app.core.utils import setup_logger
-from app.models.fine_tuned_model import FineTunedModel
 from app.queries import models as model_queries
 from app.queries.common import now_utc
 
 logger = setup_logger(__name__)
 
+# Max number of weight file deletes sent to GCS at once, across all models
+MAX_CONCURRENT_DELETES = 100
+# Max number of models cleaned up at once; more models are loaded as these finish
+MAX_CONCURRENT_MODELS = 50
+
 
 async def cleanup_deleted_model_weights(db: Optional[AsyncSession] = None) -> None:
     """Wrapper to _cleanup_deleted_model_weights that handles database session."""
@@ -27,22 +36,40 @@ async def _cleanup_deleted_model_weights(db: AsyncSession) -> None:
     try:
         logger.info("Starting model weights cleanup")
 
-        # Find recently deleted models (within last 3 days)
+        # Clean up recently deleted models (within last 3 days) concurrently, as they're loaded;
+        # the semaphore caps in-flight deletes across all of them
         cutoff_date = now_utc() - timedelta(days=3)
-        deleted_models = await model_queries.get_deleted_models(
-            db,
-            cutoff_date
-        )
-        logger.info(f"Found {len(deleted_models)} deleted models for cleanup")
-
-        if not deleted_models:
-            return
-
-        storage = Storage()
-        for model in deleted_models:
-            await _cleanup_model_weights(model, storage)
-
-        await db.commit()
+        storage = get_storage()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELETES)
+        tasks = {}
+        cleaned_model_ids = []
+        num_models = 0
+        try:
+            async for model in model_queries.stream_deleted_model_weights(db, cutoff_date):
+                # Wait for a model to finish before starting another one, so the number of
+                # tasks and loaded rows is bounded, instead of growing with the deleted models
+                if len(tasks) >= MAX_CONCURRENT_MODELS:
+                    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    _collect_cleaned_models(tasks, done, cleaned_model_ids)
+                tasks[asyncio.create_task(_cleanup_model_weights(model, storage, semaphore))] = model.id
+                num_models += 1
+        except Exception:
+            # Don't leave deletes running if loading the models fails
+            for task in tasks:
+                task.cancel()
+            raise
+        logger.info(f"Found {num_models} deleted models for cleanup")
+
+        # Wait for the remaining models; one failing model doesn't stop the others' cleanup
+        if tasks:
+            done, _ = await asyncio.wait(tasks)
+            _collect_cleaned_models(tasks, done, cleaned_model_ids)
+
+        # Remove the weight files from all cleaned up models' artifacts with a single UPDATE;
+        # skip the commit if no model had artifacts to change
+        if cleaned_model_ids:
+            await model_queries.clear_model_weight_files(db, cleaned_model_ids)
+            await db.commit()
         logger.info("Model weights cleanup complete")
 
     except Exception as e:
@@ -50,43 +77,101 @@ async def _cleanup_deleted_model_weights(db: AsyncSession) -> None:
         logger.error(f"Failed to cleanup model weights: {str(e)}")
 
 
-async def _cleanup_model_weights(model: FineTunedModel, storage: Storage) -> None:
-    """Clean up weights for a single model."""
-    if not model.artifacts:
-        logger.info(f"Model {model.id} has no artifacts, skipping")
-        return
+async def _cleanup_model_weights(
+        model: Row,
+        storage: Storage,
+        semaphore: asyncio.Semaphore
+) -> bool:
+    """
+    Clean up weights for a single model; `semaphore` is shared by all models, to cap in-flight deletes across them.
+
+    `model` is a row from `stream_deleted_model_weights`, with the model's `id`, `base_url` and `weight_files`.
+
+    Returns whether the model had weight files, which need to be removed from its artifacts.
+    """
+    if not model.weight_files:
+        # No weights, or already cleaned up by a previous run
+        return False
 
     logger.info(f"Cleaning up weights for model {model.id}")
 
     # Extract bucket and path information
-    base_url = model.artifacts['base_url']
-    # Parse gs://bucket-name/path/to/file format
-    bucket_name = base_url.split('/')[3]
-    user_id, job_id = base_url.split('/')[4:6]
-
-    # Delete each weight file
-    for weight_file in model.artifacts.get('weight_files', []):
-        weight_path = f"{user_id}/{job_id}/{weight_file}"
-        try:
+    bucket_name, user_id, job_id = _parse_base_url(model.base_url)
+
+    # Delete each weight file once, even if listed more than once
+    weight_files = model.weight_files
+    unique_weight_files = list(dict.fromkeys(weight_files))
+    if len(unique_weight_files) < len(weight_files):
+        logger.warning(f"Model {model.id} lists {len(weight_files) - len(unique_weight_files)} "
+                       f"duplicate weight files")
+
+    # Delete weight files concurrently, instead of one round-trip at a time
+    deleted = await asyncio.gather(*[
+        _delete_weight_file(model, storage, semaphore, bucket_name, f"{user_id}/{job_id}/{weight_file}")
+        for weight_file in unique_weight_files
+    ])
+
+    # One summary line per model; each deleted file is logged at debug level
+    logger.info("Deleted %d of %d weight files for model %s", sum(deleted), len(deleted), model.id)
+    return True
+
+
+def _collect_cleaned_models(tasks: Dict[asyncio.Task, UUID], done: Set[asyncio.Task],
+                            cleaned_model_ids: List[UUID]) -> None:
+    """
+    Remove finished `_cleanup_model_weights` tasks from `tasks`, and add the IDs of
+    the models they cleaned up to `cleaned_model_ids`; log the models that failed.
+    """
+    for task in done:
+        model_id = tasks.pop(task)
+        if task.exception() is not None:
+            logger.error(f"Failed to cleanup weights for model {model_id}: {str(task.exception())}")
+        elif task.result():
+            cleaned_model_ids.append(model_id)
+
+
+@lru_cache(maxsize=1024)
+def _parse_base_url(base_url: str) -> Tuple[str, str, str]:
+    """
+    Parse the bucket name, user ID and job ID from a weights base URL.
+
+    Supports both `https://storage.googleapis.com/bucket-name/user_id/job_id`
+    and `gs://bucket-name/user_id/job_id` formats.
+    """
+    # Find the separators in place, instead of splitting the URL into a list
+    start = base_url.index('://') + 3
+    if not base_url.startswith('gs://'):
+        start = base_url.index('/', start) + 1  # Skip the host
+    bucket_end = base_url.index('/', start)
+    user_id_end = base_url.index('/', bucket_end + 1)
+    job_id_end = base_url.find('/', user_id_end + 1)
+    if job_id_end == -1:
+        job_id_end = len(base_url)
+
+    bucket_name = base_url[start:bucket_end]
+    user_id = base_url[bucket_end + 1:user_id_end]
+    job_id = base_url[user_id_end + 1:job_id_end]
+    return bucket_name, user_id, job_id
+
+
+async def _delete_weight_file(
+        model: Row,
+        storage: Storage,
+        semaphore: asyncio.Semaphore,
+        bucket_name: str,
+        weight_path: str
+) -> bool:
+    """Delete a single weight file from GCS, limited by the semaphore; return whether it was deleted."""
+    try:
+        async with semaphore:
             await storage.delete(bucket=bucket_name, object_name=weight_path)
-            gs_path = f"gs://{bucket_name}/{weight_path}"
-            logger.info(f"Deleted weight file: {gs_path}")
-        except Exception as e:
-            # Log error and continue with next file, we don't want to stop the cleanup process
-            if "404" in str(e):
-                logger.warning(f"Weight file not found: {weight_path}, model {model.id}")
-            else:
-                logger.error(f"Error deleting weight file {weight_path}, model {model.id}: {str(e)}")
-
-    # Update artifacts to remove weight files
-    artifacts = _update_model_artifacts(model.artifacts)
-    model.artifacts = artifacts
-
-    logger.info(f"Deleted weights for model {model.id}")
-
-
-def _update_model_artifacts(artifacts: Dict[str, Any]) -> Dict[str, Any]:
-    """Update model artifacts to remove weight files."""
-    updated_artifacts = artifacts.copy()
-    updated_artifacts['weight_files'] = []
-    return updated_artifacts
+        logger.debug("Deleted weight file: gs://%s/%s", bucket_name, weight_path)
+        return True
+    except Exception as e:
+        # Log error and continue with next file, we don't want to stop the cleanup process
+        if "404" in str(e):
+            logger.warning(f"Weight file not found: {weight_path}, model {model.id}")
+        else:
+            logger.error(f"Error deleting weight file {weight_path}, model {model.id}: {str(e)}")
+        return False
+
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import signal
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.core.config_manager import config
+from app.core.scheduler_client import close_session as close_scheduler_session
+from app.core.storage import close_storage, warm_up_storage
+from app.core.utils import setup_logger
+from app.tasks.api_key_cleanup import cleanup_expired_api_keys
+from app.tasks.job_status_updater import update_job_statuses
+from app.tasks.model_cleanup import cleanup_deleted_model_weights
+
+logger = setup_logger(__name__)
+
+# Seconds to wait before restarting a worker process that exited; doubled on each
+# restart in a row, up to the max, and reset once a worker process stays up that long
+WORKER_RESTART_DELAY = 1
+MAX_WORKER_RESTART_DELAY = 60
+
+
+def add_background_tasks(scheduler: AsyncIOScheduler) -> None:
+    """Add the background tasks to the given scheduler."""
+    # Add the job weights cleanup task to the background scheduler
+    scheduler.add_job(cleanup_deleted_model_weights, 'interval', minutes=1)
+    # Add the API key cleanup task to the background scheduler
+    scheduler.add_job(cleanup_expired_api_keys, 'interval', minutes=1)
+    # Add the job status updater task to the background scheduler
+    if config.run_with_scheduler:
+        scheduler.add_job(update_job_statuses, 'interval', seconds=15)
+
+
+@asynccontextmanager
+async def shared_clients(warm_up: bool = True) -> AsyncIterator[None]:
+    """
+    Open the clients shared across requests and background task runs, and close them on exit.
+
+    With `warm_up`, GCS credentials are fetched now, instead of in the first weights cleanup run;
+    the scheduler API HTTP session and the GCS client are closed either way.
+    """
+    if warm_up:
+        await warm_up_storage()
+    try:
+        yield
+    finally:
+        await close_scheduler_session()
+        await close_storage()
+
+
+async def start_worker_process() -> asyncio.subprocess.Process:
+    """
+    Start a worker process that runs the background tasks, instead of the API process.
+
+    The worker gets its own, smaller, database connection pool, so background tasks
+    don't compete with requests for connections or for the API's event loop.
+    """
+    env = {
+        **os.environ,
+        'CAPI_DB_POOL_SIZE': str(config.worker_db_pool_size),
+        'CAPI_DB_MAX_OVERFLOW': '0',
+    }
+    process = await asyncio.create_subprocess_exec(sys.executable, '-m', 'app.tasks.worker', env=env)
+    logger.info(f"Started background task worker process: {process.pid}")
+    return process
+
+
+async def stop_worker_process(process: asyncio.subprocess.Process) -> None:
+    """Stop the background task worker process, and wait for it to exit."""
+    if process.returncode is None:
+        process.terminate()
+    returncode = await process.wait()
+    logger.info(f"Stopped background task worker process: {process.pid}, exit code: {returncode}")
+
+
+async def supervise_worker_process() -> None:
+    """
+    Run the background task worker process until cancelled, restarting it with backoff whenever it exits.
+
+    Otherwise, a worker that crashes would silently stop all background tasks while the API keeps serving;
+    cancelling stops the current worker process.
+    """
+    loop = asyncio.get_running_loop()
+    delay = WORKER_RESTART_DELAY
+    while True:
+        started_at = loop.time()
+        try:
+            process = await start_worker_process()
+        except Exception as e:
+            logger.error(f"Failed to start background task worker process: {str(e)}")
+        else:
+            try:
+                returncode = await process.wait()
+            except asyncio.CancelledError:
+                await stop_worker_process(process)
+                raise
+            logger.error(f"Background task worker process {process.pid} exited with code: {returncode}")
+
+        # Back off while the worker keeps failing, but not after it ran for a while
+        if loop.time() - started_at >= MAX_WORKER_RESTART_DELAY:
+            delay = WORKER_RESTART_DELAY
+        logger.info(f"Restarting background task worker process in {delay} seconds")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_WORKER_RESTART_DELAY)
+
+
+async def run_worker() -> None:
+    """Run the background tasks until the process is asked to stop."""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signal_number, stop_event.set)
+
+    async with shared_clients():
+        scheduler = AsyncIOScheduler()
+        add_background_tasks(scheduler)
+        scheduler.start()
+        logger.info("Background task worker started")
+
+        try:
+            await stop_event.wait()
+        finally:
+            scheduler.shutdown()
+    logger.info("Background task worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Set the application environment to `test`
 os.environ["CAPI_ENV"] = "test"
@@ -8,7 +9,9 @@ from uuid import uuid4
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import configure_mappers
 
+from app.core.cryptography import get_password_hash
 from app.queries.common import now_utc, make_naive
 
 # Import all models to ensure they are registered with SQLAlchemy [start]
@@ -23,6 +26,9 @@ from app.models.usage import Usage
 from app.models.user import User
 # Import all models to ensure they are registered with SQLAlchemy [end]
 
+# Configure the mappers once, at collection, instead of on the first model created by a test
+configure_mappers()
+
 
 @pytest.fixture
 def mock_db():
@@ -42,4 +48,39 @@ def mock_db():
     # Set the side effect of the mock
     db.refresh.side_effect = mock_refresh
 
+    # Make db.flush() populate the fields that the database returns on insert
+    added_objects = []
+    db.add.side_effect = added_objects.append
+
+    async def mock_flush(objects=None):
+        for obj in added_objects:
+            await mock_refresh(obj)
+
+    db.flush.side_effect = mock_flush
+
     return db
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Hash passwords with bcrypt's minimum cost in tests; hashes are just as valid, and much faster."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr('app.core.cryptography.BCRYPT_ROUNDS', 4)
+        yield
+
+
+@pytest.fixture(scope="session")
+def precomputed_hashes(fast_password_hashing):
+    """Hash the passwords used across tests once, since bcrypt is deliberately slow."""
+    passwords = [
+        "MySecurePassword123",
+        "My@#$%^&*Pass",
+        "short",
+        "averyverylongpasswordthatiswaytoolongtobeuseful",
+        "",
+        "   spaces   ",
+        "пароль123",
+    ]
+    # bcrypt releases the GIL while hashing, so threads hash in parallel
+    with ThreadPoolExecutor() as executor:
+        return dict(zip(passwords, executor.map(get_password_hash, passwords)))
@@ -2,7 +2,6 @@ from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from starlette.requests import Request
 
 from app.core.authentication import (
     get_api_key,
@@ -22,10 +21,23 @@ from app.models.user import User
 from app.queries.common import now_utc, make_naive
 
 
+@pytest.fixture(scope="module")
+def cached_user():
+    """Create the spec'd user mock once per module; building it introspects the model."""
+    return MagicMock(spec=User)
+
+
+@pytest.fixture(scope="module")
+def cached_api_key():
+    """Create the spec'd API key mock once per module; building it introspects the model."""
+    return MagicMock(spec=ApiKey)
+
+
 @pytest.fixture
-def mock_user():
-    """Create a mock user object."""
-    user = MagicMock(spec=User)
+def mock_user(cached_user):
+    """Reset the cached user mock, since tests change its fields."""
+    user = cached_user
+    user.reset_mock(return_value=True, side_effect=True)
     user.id = "test-user-id"
     user.email = "test@example.com"
     user.status = UserStatus.ACTIVE
@@ -35,9 +47,10 @@ def mock_user():
 
 
 @pytest.fixture
-def mock_api_key():
-    """Create a mock API key object."""
-    api_key = MagicMock(spec=ApiKey)
+def mock_api_key(cached_api_key):
+    """Reset the cached API key mock, since tests change its fields."""
+    api_key = cached_api_key
+    api_key.reset_mock(return_value=True, side_effect=True)
     api_key.user_id = "test-user-id"
     api_key.prefix = "test1234"
     api_key.status = ApiKeyStatus.ACTIVE
@@ -48,8 +61,8 @@ def mock_api_key():
 
 @pytest.fixture
 def mock_request():
-    """Create a mock request object."""
-    request = MagicMock(spec=Request)
+    """Create a mock request object; only its session is used, so it isn't spec'd."""
+    request = MagicMock()
     request.session = {}
     return request
 
@@ -5,38 +5,48 @@ import yaml
 
 from app.core.config_manager import ConfigManager, is_truthy, is_falsy
 
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Default config
+DEFAULT_YAML = yaml.dump({
+    "log_level": "INFO",
+    "log_stdout": True,
+    "db_name": "test_db",
+    "db_user": "test_user",
+    "db_pass": "test_pass",
+    "db_host": "localhost",
+    "db_port": "5432"
+}, Dumper=YamlDumper)
+
+# Env-specific config
+DEV_YAML = yaml.dump({
+    "log_level": "DEBUG",
+    "db_name": "dev_db"
+}, Dumper=YamlDumper)
+
+
+@pytest.fixture(scope="session")
+def temp_config_dir(tmp_path_factory):
+    """Create temporary config directory with test YAML files, shared by all tests since they only read it."""
+    config_dir = tmp_path_factory.mktemp("app-configs")
+    (config_dir / "default.yml").write_text(DEFAULT_YAML)
+    (config_dir / "dev.yml").write_text(DEV_YAML)
+    return str(config_dir)
+
 
 @pytest.fixture
-def temp_config_dir(tmp_path):
-    """Create temporary config directory with test YAML files."""
-    config_dir = tmp_path / "app-configs"
-    config_dir.mkdir()
-
-    # Create default config
-    default_config = {
-        "log_level": "INFO",
+def config_dict():
+    """Create the merged test configuration, for tests that don't exercise file loading."""
+    return {
+        "log_level": "DEBUG",
         "log_stdout": True,
-        "db_name": "test_db",
+        "db_name": "dev_db",
         "db_user": "test_user",
         "db_pass": "test_pass",
         "db_host": "localhost",
         "db_port": "5432"
     }
 
-    with open(config_dir / "default.yml", "w") as f:
-        yaml.dump(default_config, f)
-
-    # Create env-specific config
-    dev_config = {
-        "log_level": "DEBUG",
-        "db_name": "dev_db"
-    }
-
-    with open(config_dir / "dev.yml", "w") as f:
-        yaml.dump(dev_config, f)
-
-    return str(config_dir)
-
 
 def test_config_loading(temp_config_dir, monkeypatch):
     """Test basic configuration loading."""
@@ -57,35 +67,29 @@ def test_config_loading(temp_config_dir, monkeypatch):
     assert config.db_name == "dev_db"
 
 
-def test_environment_variable_override(temp_config_dir, monkeypatch):
+def test_environment_variable_override(config_dict, monkeypatch):
     """Test environment variable overrides."""
-    monkeypatch.setenv("CAPI_CONF_PATH", temp_config_dir)
-    monkeypatch.setenv("CAPI_ENV", "dev")
     monkeypatch.setenv("CAPI_DB_HOST", "custom-host")
     monkeypatch.setenv("CAPI_LOG_STDOUT", "false")
 
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
 
     # Check environment variable overrides
     assert config.db_host == "custom-host"
     assert config.log_stdout is False
 
 
-def test_default_environment(temp_config_dir, monkeypatch):
+def test_default_environment(config_dict, monkeypatch):
     """Test default environment when none specified."""
-    monkeypatch.setenv("CAPI_CONF_PATH", temp_config_dir)
     monkeypatch.delenv("CAPI_ENV", raising=False)
 
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
     assert config.env_name == "local"
 
 
-def test_database_url_construction(temp_config_dir, monkeypatch):
+def test_database_url_construction(config_dict, monkeypatch):
     """Test database URL construction."""
-    monkeypatch.setenv("CAPI_CONF_PATH", temp_config_dir)
-    monkeypatch.setenv("CAPI_ENV", "dev")
-
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
     expected_url = f"postgresql+asyncpg://{config.db_user}:{config.db_pass}@{config.db_host}:{config.db_port}/{config.db_name}"
     assert config.database_url == expected_url
 
@@ -101,32 +105,27 @@ def test_missing_config_file(temp_config_dir, monkeypatch):
     assert config.db_user == "test_user"
 
 
-def test_env_var_type_conversion(temp_config_dir, monkeypatch):
+def test_env_var_type_conversion(config_dict, monkeypatch):
     """Test environment variable type conversion."""
-    monkeypatch.setenv("CAPI_CONF_PATH", temp_config_dir)
-    monkeypatch.setenv("CAPI_ENV", "dev")
-
     # Test boolean conversion
     monkeypatch.setenv("CAPI_LOG_STDOUT", "true")
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
     assert config.log_stdout is True
 
     monkeypatch.setenv("CAPI_LOG_STDOUT", "1")
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
     assert config.log_stdout is True
 
     monkeypatch.setenv("CAPI_LOG_STDOUT", "false")
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
     assert config.log_stdout is False
 
 
-def test_empty_env_vars(temp_config_dir, monkeypatch):
+def test_empty_env_vars(config_dict, monkeypatch):
     """Test handling of empty environment variables."""
-    monkeypatch.setenv("CAPI_CONF_PATH", temp_config_dir)
-    monkeypatch.setenv("CAPI_ENV", "dev")
     monkeypatch.setenv("CAPI_DB_HOST", "")
 
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
     # Empty env var should not override config file value
     assert config.db_host == "localhost"
 
@@ -152,12 +151,9 @@ def test_truthy_falsy_helpers():
     assert not is_falsy("1")
 
 
-def test_config_environment_export(temp_config_dir, monkeypatch):
+def test_config_environment_export(config_dict, monkeypatch):
     """Test exporting of config values to environment variables."""
-    monkeypatch.setenv("CAPI_CONF_PATH", temp_config_dir)
-    monkeypatch.setenv("CAPI_ENV", "dev")
-
-    config = ConfigManager()
+    config = ConfigManager(config_dict)
 
     # Check if config values are exported to environment
     assert os.environ.get("db_name") == config.db_name
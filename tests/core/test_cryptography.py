@@ -1,22 +1,49 @@
-from app.core.cryptography import verify_password, get_password_hash, generate_api_key
-
-
-def test_password_hashing_and_verification():
+import re
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.core.cryptography import (
+    verify_password,
+    verify_password_async,
+    get_password_hash,
+    generate_api_key
+)
+
+# Characters of URL safe base64, which API keys are encoded with
+URL_SAFE_KEY = re.compile(r'[A-Za-z0-9_-]+')
+
+
+@pytest.mark.parametrize("password,wrong_password", [
+    # Typical password
+    ("MySecurePassword123", "WrongPassword123"),
+    # Special characters
+    ("My@#$%^&*Pass", "My@#$%^&*Pas"),
+])
+def test_password_hashing_and_verification(precomputed_hashes, password, wrong_password):
     """Test password hashing and verification flow."""
-    # Test with a typical password
-    password = "MySecurePassword123"
-    hashed = get_password_hash(password)
+    hashed = precomputed_hashes[password]
 
     # Verify correct password
     assert verify_password(password, hashed)
 
     # Verify incorrect password
-    assert not verify_password("WrongPassword123", hashed)
+    assert not verify_password(wrong_password, hashed)
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async(precomputed_hashes):
+    """Test that async verification gives the same results, off the event loop thread."""
+    password = "MySecurePassword123"
+    hashed = precomputed_hashes[password]
+
+    assert await verify_password_async(password, hashed)
+    assert not await verify_password_async("WrongPassword123", hashed)
 
-    # Test with special characters
-    password_special = "My@#$%^&*Pass"
-    hashed_special = get_password_hash(password_special)
-    assert verify_password(password_special, hashed_special)
+    # Verify bcrypt runs on the executor, not the event loop thread
+    with patch('app.core.cryptography.checkpw', side_effect=lambda *args: threading.current_thread().name):
+        assert (await verify_password_async(password, hashed)).startswith('bcrypt')
 
 
 def test_password_hash_consistency():
@@ -35,59 +62,55 @@ def test_password_hash_consistency():
     assert verify_password(password, hash2)
 
 
-def test_password_hash_length():
+def test_password_hash_length(precomputed_hashes):
     """Test that password hashes have consistent length."""
     # Test with different length passwords
     short_pass = "short"
     long_pass = "averyverylongpasswordthatiswaytoolongtobeuseful"
 
-    short_hash = get_password_hash(short_pass)
-    long_hash = get_password_hash(long_pass)
+    short_hash = precomputed_hashes[short_pass]
+    long_hash = precomputed_hashes[long_pass]
 
     # Hash lengths should be the same regardless of password length
     assert len(short_hash) == len(long_hash)
 
 
-def test_generate_api_key():
-    """Test API key generation."""
-    # Generate multiple API keys
-    key1, hash1 = generate_api_key()
-    key2, hash2 = generate_api_key()
+def test_api_key_uniqueness():
+    """Test that generated API keys are unique; hashing is skipped, the roundtrip test covers it."""
+    with patch('app.core.cryptography.get_password_hash', side_effect=lambda key: f"hash-{key}"):
+        keys = [generate_api_key()[0] for _ in range(100)]
 
     # Keys should be different
-    assert key1 != key2
-    assert hash1 != hash2
+    assert len(set(keys)) == len(keys)
 
     # Keys should be properly formatted
-    assert len(key1) > 32  # At least 32 bytes of randomness
-    assert isinstance(key1, str)
-    assert isinstance(hash1, str)
+    assert all(isinstance(key, str) and len(key) > 32 for key in keys)  # At least 32 bytes of randomness
 
-    # Hashes should verify against their keys
-    assert verify_password(key1, hash1)
-    assert verify_password(key2, hash2)
 
-    # Hashes should not verify against wrong keys
-    assert not verify_password(key1, hash2)
-    assert not verify_password(key2, hash1)
+def test_api_key_roundtrip():
+    """Test that an API key hash verifies against its key."""
+    key, hash = generate_api_key()
+
+    # Wrong keys are covered by the password verification tests
+    assert verify_password(key, hash)
 
 
-def test_password_verification_edge_cases():
+def test_password_verification_edge_cases(precomputed_hashes):
     """Test password verification with edge cases."""
     # Test empty password
-    empty_hash = get_password_hash("")
+    empty_hash = precomputed_hashes[""]
     assert verify_password("", empty_hash)
     assert not verify_password("notempty", empty_hash)
 
     # Test whitespace
     space_password = "   spaces   "
-    space_hash = get_password_hash(space_password)
+    space_hash = precomputed_hashes[space_password]
     assert verify_password(space_password, space_hash)
     assert not verify_password("spaces", space_hash)
 
     # Test Unicode
     unicode_password = "пароль123"
-    unicode_hash = get_password_hash(unicode_password)
+    unicode_hash = precomputed_hashes[unicode_password]
     assert verify_password(unicode_password, unicode_hash)
     assert not verify_password("password123", unicode_hash)
 
@@ -97,7 +120,7 @@ def test_api_key_format():
     key, hash = generate_api_key()
 
     # Key should be URL safe
-    assert all(c.isalnum() or c in '-_' for c in key)
+    assert URL_SAFE_KEY.fullmatch(key)
 
     # Key should be of reasonable length
     assert 32 <= len(key) <= 64  # typical range for secure tokens
@@ -38,6 +38,33 @@ from app.core.exceptions import (
     generic_exception_handler
 )
 
+# Exception types, with their status codes and a sample detail
+EXCEPTIONS = (
+    (NotFoundError, 404, "Not found"),
+    (UnauthorizedError, 401, "Unauthorized"),
+    (ForbiddenError, 403, "Forbidden"),
+    (BadRequestError, 422, "Bad request"),
+    (ServerError, 500, "Server error"),
+    (PaymentNeededError, 402, "Payment needed"),
+    (InvalidApiKeyError, 401, "Invalid API key"),
+    (InvalidUserSessionError, 401, "Invalid session"),
+    (UserNotFoundError, 404, "User not found"),
+    (EmailAlreadyExistsError, 422, "Email exists"),
+    (ApiKeyAlreadyExistsError, 422, "API key exists"),
+    (ApiKeyNotFoundError, 404, "API key not found"),
+    (DatasetAlreadyExistsError, 422, "Dataset exists"),
+    (DatasetNotFoundError, 404, "Dataset not found"),
+    (BaseModelNotFoundError, 404, "Base model not found"),
+    (FineTunedModelNotFoundError, 404, "Fine-tuned model not found"),
+    (FineTuningJobNotFoundError, 404, "Job not found"),
+    (FineTuningJobAlreadyExistsError, 422, "Job exists"),
+    (FineTuningJobCreationError, 500, "Job creation failed"),
+    (FineTuningJobRefreshError, 500, "Job refresh failed"),
+    (FineTuningJobCancellationError, 500, "Job cancellation failed"),
+    (StripeCheckoutSessionCreationError, 500, "Stripe session failed"),
+    (StorageError, 500, "Storage error"),
+)
+
 
 @pytest.fixture
 def mock_logger():
@@ -45,9 +72,9 @@ def mock_logger():
     return logging.getLogger("test_logger")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_request():
-    """Create a mock request for testing handlers."""
+    """Create a mock request for testing handlers; shared, since the handlers don't read or change it."""
 
     async def mock_body():
         return b""
@@ -81,38 +108,12 @@ def test_exception_logging(mock_logger):
     assert warning_exc.status_code == 422
 
 
-def test_specific_exceptions(mock_logger):
+@pytest.mark.parametrize("exc_class,status_code,detail", EXCEPTIONS)
+def test_specific_exceptions(mock_logger, exc_class, status_code, detail):
     """Test all specific exception types."""
-    exceptions = [
-        (NotFoundError, 404, "Not found"),
-        (UnauthorizedError, 401, "Unauthorized"),
-        (ForbiddenError, 403, "Forbidden"),
-        (BadRequestError, 422, "Bad request"),
-        (ServerError, 500, "Server error"),
-        (PaymentNeededError, 402, "Payment needed"),
-        (InvalidApiKeyError, 401, "Invalid API key"),
-        (InvalidUserSessionError, 401, "Invalid session"),
-        (UserNotFoundError, 404, "User not found"),
-        (EmailAlreadyExistsError, 422, "Email exists"),
-        (ApiKeyAlreadyExistsError, 422, "API key exists"),
-        (ApiKeyNotFoundError, 404, "API key not found"),
-        (DatasetAlreadyExistsError, 422, "Dataset exists"),
-        (DatasetNotFoundError, 404, "Dataset not found"),
-        (BaseModelNotFoundError, 404, "Base model not found"),
-        (FineTunedModelNotFoundError, 404, "Fine-tuned model not found"),
-        (FineTuningJobNotFoundError, 404, "Job not found"),
-        (FineTuningJobAlreadyExistsError, 422, "Job exists"),
-        (FineTuningJobCreationError, 500, "Job creation failed"),
-        (FineTuningJobRefreshError, 500, "Job refresh failed"),
-        (FineTuningJobCancellationError, 500, "Job cancellation failed"),
-        (StripeCheckoutSessionCreationError, 500, "Stripe session failed"),
-        (StorageError, 500, "Storage error"),
-    ]
-
-    for exc_class, status_code, detail in exceptions:
-        exc = exc_class(detail, mock_logger)
-        assert exc.status_code == status_code
-        assert exc.detail == detail
+    exc = exc_class(detail, mock_logger)
+    assert exc.status_code == status_code
+    assert exc.detail == detail
 
 
 @pytest.mark.asyncio
@@ -163,37 +164,11 @@ async def test_generic_exception_handler(mock_request):
     assert "unexpected error" in content["message"].lower()
 
 
-def test_exception_inheritance():
+@pytest.mark.parametrize("exc_class", [exc_class for exc_class, _, _ in EXCEPTIONS])
+def test_exception_inheritance(exc_class):
     """Test exception inheritance hierarchy."""
     # Test that all custom exceptions inherit from AppException
-    exceptions = [
-        NotFoundError,
-        UnauthorizedError,
-        ForbiddenError,
-        BadRequestError,
-        ServerError,
-        PaymentNeededError,
-        InvalidApiKeyError,
-        InvalidUserSessionError,
-        UserNotFoundError,
-        EmailAlreadyExistsError,
-        ApiKeyAlreadyExistsError,
-        ApiKeyNotFoundError,
-        DatasetAlreadyExistsError,
-        DatasetNotFoundError,
-        BaseModelNotFoundError,
-        FineTunedModelNotFoundError,
-        FineTuningJobNotFoundError,
-        FineTuningJobAlreadyExistsError,
-        FineTuningJobCreationError,
-        FineTuningJobRefreshError,
-        FineTuningJobCancellationError,
-        StripeCheckoutSessionCreationError,
-        StorageError,
-    ]
-
-    for exc_class in exceptions:
-        assert issubclass(exc_class, AppException)
+    assert issubclass(exc_class, AppException)
 
 
 def test_exception_attributes():
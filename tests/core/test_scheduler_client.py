@@ -1,8 +1,9 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 from uuid import UUID
 
 import pytest
-from aiohttp import ClientSession
 
 from app.core.constants import FineTuningJobStatus
 from app.core.exceptions import (
@@ -10,79 +11,117 @@ from app.core.exceptions import (
     FineTuningJobRefreshError,
     FineTuningJobCancellationError
 )
+# noinspection PyProtectedMember
 from app.core.scheduler_client import (
+    _get_session,
+    close_session,
     start_fine_tuning_job,
     fetch_job_details,
+    fetch_job_details_bulk,
     stop_fine_tuning_job
 )
 
+JOB_ID = UUID('12345678-1234-5678-1234-567812345678')
+USER_ID = UUID('98765432-9876-5432-9876-987654321098')
+
 
 @pytest.fixture
 def mock_job():
     """Create a mock fine-tuning job."""
-    job = MagicMock()
-    job.id = UUID('12345678-1234-5678-1234-567812345678')
-    job.user_id = UUID('98765432-9876-5432-9876-987654321098')
-    job.provider = MagicMock(value='GCP')
-    job.status = FineTuningJobStatus.NEW
-    return job
+    return SimpleNamespace(
+        id=JOB_ID,
+        user_id=USER_ID,
+        provider=SimpleNamespace(value='GCP'),
+        status=FineTuningJobStatus.NEW
+    )
 
 
 @pytest.fixture
 def mock_dataset():
     """Create a mock dataset."""
-    dataset = MagicMock()
-    dataset.file_name = "test_dataset.jsonl"
-    return dataset
+    return SimpleNamespace(file_name="test_dataset.jsonl")
 
 
 @pytest.fixture
 def mock_base_model():
     """Create a mock base model."""
-    base_model = MagicMock()
-    base_model.name = "test_model"
-    base_model.cluster_config = {
-        "lora": {
-            "num_gpus": 1,
-            "gpu_type": "test-gpu"
-        },
-        "qlora": {
-            "num_gpus": 1,
-            "gpu_type": "test-gpu"
-        },
-        "full": {
-            "num_gpus": 2,
-            "gpu_type": "test-gpu"
+    return SimpleNamespace(
+        name="test_model",
+        cluster_config={
+            "lora": {
+                "num_gpus": 1,
+                "gpu_type": "test-gpu"
+            },
+            "qlora": {
+                "num_gpus": 1,
+                "gpu_type": "test-gpu"
+            },
+            "full": {
+                "num_gpus": 2,
+                "gpu_type": "test-gpu"
+            }
         }
-    }
-    return base_model
+    )
 
 
 @pytest.fixture
 def mock_job_detail():
     """Create a mock job detail."""
-    detail = MagicMock()
-    detail.parameters = {
+    return SimpleNamespace(parameters={
         "batch_size": 2,
         "shuffle": True,
         "num_epochs": 1,
         "use_lora": True,
         "use_qlora": False
-    }
-    return detail
+    })
 
 
 @pytest.fixture
 def mock_user():
     """Create a mock user."""
-    user = MagicMock()
-    user.id = UUID('98765432-9876-5432-9876-987654321098')
-    return user
+    return SimpleNamespace(id=USER_ID)
+
+
+class FakeResponse:
+    """A scheduler API response, used as `async with session.post(...) as response`."""
+
+    def __init__(self, status, json_data=None, text_data=None):
+        self.status = status
+        self._json_data = json_data
+        self._text_data = text_data
+
+    async def json(self):
+        return self._json_data
+
+    async def text(self):
+        return self._text_data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """Create a factory for the shared scheduler HTTP session, responding with the given status and body."""
+    def make_session(status, json_data=None, text_data=None):
+        # Not spec'd against `ClientSession`, only `post()` is used
+        session = SimpleNamespace(
+            closed=False,
+            post=MagicMock(return_value=FakeResponse(status, json_data, text_data))
+        )
+        monkeypatch.setattr('app.core.scheduler_client._session', session)
+        return session
+
+    return make_session
 
 
 @pytest.mark.asyncio
 async def test_start_fine_tuning_job_success(
         mock_db,
+        mock_session,
         mock_job,
         mock_dataset,
         mock_base_model,
@@ -94,187 +133,169 @@ async def test_start_fine_tuning_job_success(
     with patch('app.core.scheduler_client.ft_queries.get_job_with_details_full') as mock_query:
         mock_query.return_value = (mock_job, mock_dataset, mock_base_model, mock_job_detail)
 
-        # Mock aiohttp session
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_session = AsyncMock(spec=ClientSession)
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.post.return_value.__aenter__.return_value = mock_response
-
-        with patch('aiohttp.ClientSession', return_value=mock_session):
-            # Call the function
-            await start_fine_tuning_job(mock_db, mock_job.id, mock_user.id)
-
-            # Verify the scheduler API was called correctly
-            mock_session.post.assert_called_once()
-            call_args = mock_session.post.call_args
-            assert "jobs/gcp" in call_args[0][0]
-
-            # Verify payload structure
-            payload = call_args[1]['json']
-            assert payload['job_id'] == str(mock_job.id)
-            assert payload['workflow'] == 'torchtunewrapper'
-            assert 'args' in payload
-            assert payload['gpu_type'] == 'test-gpu'
-            assert payload['num_gpus'] == 1
+        # Mock the scheduler API response
+        session = mock_session(200)
 
+        # Call the function
+        await start_fine_tuning_job(mock_db, mock_job.id, mock_user.id)
 
-@pytest.mark.asyncio
-async def test_start_fine_tuning_job_validation_error(mock_db, mock_job):
-    """Test job start with validation error."""
-    # Mock the job query
-    with patch('app.core.scheduler_client.ft_queries.get_job_with_details_full') as mock_query:
-        mock_query.return_value = None
-
-        with pytest.raises(FineTuningJobCreationError) as exc_info:
-            await start_fine_tuning_job(mock_db, mock_job.id, mock_job.user_id)
+        # Verify the scheduler API was called correctly
+        session.post.assert_called_once()
+        call_args = session.post.call_args
+        assert "jobs/gcp" in call_args[0][0]
 
-        assert "Failed to find job" in str(exc_info.value)
+        # Verify payload structure
+        payload = call_args[1]['json']
+        assert payload['job_id'] == str(mock_job.id)
+        assert payload['workflow'] == 'torchtunewrapper'
+        assert 'args' in payload
+        assert payload['gpu_type'] == 'test-gpu'
+        assert payload['num_gpus'] == 1
 
 
 @pytest.mark.asyncio
-async def test_start_fine_tuning_job_scheduler_error(
+@pytest.mark.parametrize("job_found,status,json_data,text_data,expected_message", [
+    # Job not found
+    (False, None, None, None, "Failed to find job"),
+    # Scheduler validation error
+    (True, 422, {"message": "Validation error"}, None, "Validation error"),
+    # Scheduler server error
+    (True, 500, None, "Internal server error", "Internal server error"),
+])
+async def test_start_fine_tuning_job_error(
         mock_db,
+        mock_session,
         mock_job,
         mock_dataset,
         mock_base_model,
         mock_job_detail,
-        mock_user
+        job_found,
+        status,
+        json_data,
+        text_data,
+        expected_message
 ):
-    """Test job start with scheduler error."""
+    """Test job start with a missing job, or a scheduler error."""
     # Mock the job query
     with patch('app.core.scheduler_client.ft_queries.get_job_with_details_full') as mock_query:
-        mock_query.return_value = (mock_job, mock_dataset, mock_base_model, mock_job_detail)
+        mock_query.return_value = (mock_job, mock_dataset, mock_base_model, mock_job_detail) if job_found else None
 
-        # Mock aiohttp session with error response
-        mock_response = AsyncMock()
-        mock_response.status = 422
-        mock_response.json = AsyncMock(return_value={"message": "Validation error"})
-        mock_session = AsyncMock(spec=ClientSession)
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.post.return_value.__aenter__.return_value = mock_response
+        # Mock the scheduler API response
+        mock_session(status, json_data=json_data, text_data=text_data)
 
-        with patch('aiohttp.ClientSession', return_value=mock_session):
-            with pytest.raises(FineTuningJobCreationError) as exc_info:
-                await start_fine_tuning_job(mock_db, mock_job.id, mock_user.id)
+        with pytest.raises(FineTuningJobCreationError) as exc_info:
+            await start_fine_tuning_job(mock_db, JOB_ID, USER_ID)
 
-            assert "Validation error" in str(exc_info.value)
+        assert expected_message in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_fetch_job_details_success():
+async def test_fetch_job_details_success(mock_session):
     """Test successful job details fetch."""
-    user_id = UUID('98765432-9876-5432-9876-987654321098')
-    job_ids = [UUID('12345678-1234-5678-1234-567812345678')]
+    user_id = USER_ID
+    job_ids = [JOB_ID]
     expected_response = [{"job_id": str(job_ids[0]), "status": "RUNNING"}]
 
-    # Mock aiohttp session
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value=expected_response)
-    mock_session = AsyncMock(spec=ClientSession)
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.post.return_value.__aenter__.return_value = mock_response
+    # Mock the scheduler API response
+    session = mock_session(200, json_data=expected_response)
 
-    with patch('aiohttp.ClientSession', return_value=mock_session):
-        result = await fetch_job_details(user_id, job_ids)
-        assert result == expected_response
+    result = await fetch_job_details(user_id, job_ids)
+    assert result == expected_response
 
-        # Verify correct API call
-        mock_session.post.assert_called_once()
-        call_args = mock_session.post.call_args
-        assert "jobs/get_by_user_and_ids" in call_args[0][0]
+    # Verify correct API call
+    session.post.assert_called_once()
+    call_args = session.post.call_args
+    assert "jobs/get_by_user_and_ids" in call_args[0][0]
 
-        # Verify payload
-        payload = call_args[1]['json']
-        assert payload['user_id'] == str(user_id)
-        assert payload['job_ids'] == [str(job_ids[0])]
+    # Verify payload
+    payload = call_args[1]['json']
+    assert payload['user_id'] == str(user_id)
+    assert payload['job_ids'] == [str(job_ids[0])]
 
 
 @pytest.mark.asyncio
-async def test_fetch_job_details_error():
+async def test_fetch_job_details_error(mock_session):
     """Test job details fetch with error."""
-    user_id = UUID('98765432-9876-5432-9876-987654321098')
-    job_ids = [UUID('12345678-1234-5678-1234-567812345678')]
+    user_id = USER_ID
+    job_ids = [JOB_ID]
 
-    # Mock aiohttp session with error
-    mock_response = AsyncMock()
-    mock_response.status = 500
-    mock_response.text = AsyncMock(return_value="Internal server error")
-    mock_session = AsyncMock(spec=ClientSession)
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.post.return_value.__aenter__.return_value = mock_response
+    # Mock the scheduler API response
+    mock_session(500, text_data="Internal server error")
 
-    with patch('aiohttp.ClientSession', return_value=mock_session):
-        with pytest.raises(FineTuningJobRefreshError) as exc_info:
-            await fetch_job_details(user_id, job_ids)
+    with pytest.raises(FineTuningJobRefreshError) as exc_info:
+        await fetch_job_details(user_id, job_ids)
 
-        assert "Error refreshing job statuses" in str(exc_info.value)
+    assert "Error refreshing job statuses" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_stop_fine_tuning_job_success():
+async def test_fetch_job_details_bulk_success(mock_session):
+    """Test successful bulk job details fetch."""
+    user_id = USER_ID
+    job_ids = [JOB_ID]
+    expected_response = [{"job_id": str(job_ids[0]), "status": "RUNNING"}]
+
+    # Mock the scheduler API response
+    session = mock_session(200, json_data=expected_response)
+
+    result = await fetch_job_details_bulk({user_id: job_ids})
+    assert result == expected_response
+
+    # Verify a single API call was made for all users
+    session.post.assert_called_once()
+    call_args = session.post.call_args
+    assert "jobs/get_by_users_and_ids" in call_args[0][0]
+
+    # Verify payload
+    payload = call_args[1]['json']
+    assert payload == [{"user_id": str(user_id), "job_ids": [str(job_ids[0])]}]
+
+
+@pytest.mark.asyncio
+async def test_stop_fine_tuning_job_success(mock_session):
     """Test successful job stop."""
-    job_id = UUID('12345678-1234-5678-1234-567812345678')
-    user_id = UUID('98765432-9876-5432-9876-987654321098')
+    job_id = JOB_ID
+    user_id = USER_ID
 
-    # Mock aiohttp session
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value={"status": "stopping"})
-    mock_session = AsyncMock(spec=ClientSession)
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.post.return_value.__aenter__.return_value = mock_response
+    # Mock the scheduler API response
+    session = mock_session(200, json_data={"status": "stopping"})
 
-    with patch('aiohttp.ClientSession', return_value=mock_session):
-        result = await stop_fine_tuning_job(job_id, user_id)
-        assert result == {"status": "stopping"}
+    result = await stop_fine_tuning_job(job_id, user_id)
+    assert result == {"status": "stopping"}
 
-        # Verify correct API call
-        mock_session.post.assert_called_once()
-        assert f"jobs/gcp/stop/{job_id}/{user_id}" in mock_session.post.call_args[0][0]
+    # Verify correct API call
+    session.post.assert_called_once()
+    assert f"jobs/gcp/stop/{job_id}/{user_id}" in session.post.call_args[0][0]
 
 
 @pytest.mark.asyncio
-async def test_stop_fine_tuning_job_not_found():
+async def test_stop_fine_tuning_job_not_found(mock_session):
     """Test job stop when job not found."""
-    job_id = UUID('12345678-1234-5678-1234-567812345678')
-    user_id = UUID('98765432-9876-5432-9876-987654321098')
+    job_id = JOB_ID
+    user_id = USER_ID
 
-    # Mock aiohttp session with not found error
-    mock_response = AsyncMock()
-    mock_response.status = 404
-    mock_response.text = AsyncMock(return_value="Job not found")
-    mock_session = AsyncMock(spec=ClientSession)
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.post.return_value.__aenter__.return_value = mock_response
+    # Mock the scheduler API response
+    mock_session(404, text_data="Job not found")
 
-    with patch('aiohttp.ClientSession', return_value=mock_session):
-        with pytest.raises(FineTuningJobCancellationError) as exc_info:
-            await stop_fine_tuning_job(job_id, user_id)
+    with pytest.raises(FineTuningJobCancellationError) as exc_info:
+        await stop_fine_tuning_job(job_id, user_id)
 
-        assert "Job not found or not running" in str(exc_info.value)
+    assert "Job not found or not running" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_stop_fine_tuning_job_error():
+async def test_stop_fine_tuning_job_error(mock_session):
     """Test job stop with error."""
-    job_id = UUID('12345678-1234-5678-1234-567812345678')
-    user_id = UUID('98765432-9876-5432-9876-987654321098')
+    job_id = JOB_ID
+    user_id = USER_ID
 
-    # Mock aiohttp session with error
-    mock_response = AsyncMock()
-    mock_response.status = 500
-    mock_response.text = AsyncMock(return_value="Internal server error")
-    mock_session = AsyncMock(spec=ClientSession)
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.post.return_value.__aenter__.return_value = mock_response
+    # Mock the scheduler API response
+    mock_session(500, text_data="Internal server error")
 
-    with patch('aiohttp.ClientSession', return_value=mock_session):
-        with pytest.raises(FineTuningJobCancellationError) as exc_info:
-            await stop_fine_tuning_job(job_id, user_id)
+    with pytest.raises(FineTuningJobCancellationError) as exc_info:
+        await stop_fine_tuning_job(job_id, user_id)
 
-        assert "Failed to stop job" in str(exc_info.value)
+    assert "Failed to stop job" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
@@ -282,9 +303,27 @@ async def test_scheduler_disabled(mock_db):
     """Test behavior when scheduler is disabled."""
     with patch('app.core.scheduler_client.config.run_with_scheduler', False):
         # All functions should return early without error
-        job_id = UUID('12345678-1234-5678-1234-567812345678')
-        user_id = UUID('98765432-9876-5432-9876-987654321098')
+        job_id = JOB_ID
+        user_id = USER_ID
+
+        results = await asyncio.gather(
+            start_fine_tuning_job(mock_db, job_id, user_id),
+            fetch_job_details(user_id, [job_id]),
+            stop_fine_tuning_job(job_id, user_id),
+        )
+        assert results == [None, [], None]
+
+
+@pytest.mark.asyncio
+async def test_shared_session_reused_and_closed():
+    """Test that scheduler requests share one HTTP session until it's closed."""
+    await close_session()
+
+    session = _get_session()
+    assert _get_session() is session
+
+    await close_session()
+    assert session.closed
+    assert _get_session() is not session
 
-        await start_fine_tuning_job(mock_db, job_id, user_id)
-        assert await fetch_job_details(user_id, [job_id]) == []
-        assert await stop_fine_tuning_job(job_id, user_id) is None
+    await close_session()
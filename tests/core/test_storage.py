@@ -2,11 +2,24 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID
 
 import pytest
-from aiohttp import ClientResponseError, ClientSession
+from aiohttp import ClientResponseError
 from gcloud.aio.storage import Storage
 
 from app.core.exceptions import ServerError, StorageError
-from app.core.storage import upload_file, delete_file, handle_gcs_error
+from app.core.storage import (
+    upload_file,
+    delete_file,
+    handle_gcs_error,
+    get_storage,
+    close_storage,
+    warm_up_storage
+)
+
+# GCS errors, built once; tests only read their status and message
+REQUEST_INFO = MagicMock()
+ERROR_404 = ClientResponseError(status=404, message="Not Found", request_info=REQUEST_INFO, history=())
+ERROR_AUTH = ClientResponseError(status=400, message="invalid_grant", request_info=REQUEST_INFO, history=())
+ERROR_500 = ClientResponseError(status=500, message="Internal Server Error", request_info=REQUEST_INFO, history=())
 
 
 @pytest.fixture
@@ -21,97 +34,62 @@ def mock_file():
 
 
 @pytest.fixture
-def mock_storage():
-    """Create a mock Storage instance."""
-    return AsyncMock(spec=Storage)
-
-
-@pytest.fixture
-def mock_session():
-    """Create a mock aiohttp ClientSession."""
-    session = AsyncMock(spec=ClientSession)
-    return session
+def mock_storage(monkeypatch):
+    """Patch the GCS client, and the HTTP session, that uploads and deletes create; returns the client."""
+    storage = AsyncMock(spec=Storage)
+    monkeypatch.setattr('app.core.storage.Storage', MagicMock(return_value=storage))
+    monkeypatch.setattr('app.core.storage.ClientSession', MagicMock())
+    return storage
 
 
 @pytest.mark.asyncio
-async def test_upload_file_success(mock_file):
+async def test_upload_file_success(mock_file, mock_storage):
     """Test successful file upload."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
 
-    # Mock the storage client
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.upload = AsyncMock()
-        mock_session.return_value.__aenter__.return_value = mock_session
+    # Call the function
+    result = await upload_file('lum-pipeline-zen-jobs-us', path, mock_file, user_id)
 
-        # Call the function
-        result = await upload_file('lum-pipeline-zen-jobs-us', path, mock_file, user_id)
+    # Verify the upload was called correctly
+    mock_storage.upload.assert_called_once()
+    call_args = mock_storage.upload.call_args
 
-        # Verify the upload was called correctly
-        mock_storage.upload.assert_called_once()
-        call_args = mock_storage.upload.call_args
-
-        assert call_args[1]['bucket'] == "lum-pipeline-zen-jobs-us"
-        assert "test_path" in call_args[1]['object_name']
-        assert call_args[1]['content_type'] == "text/plain"
-        assert isinstance(result, str)
-        assert result.endswith("test_file.txt")
+    assert call_args[1]['bucket'] == "lum-pipeline-zen-jobs-us"
+    assert "test_path" in call_args[1]['object_name']
+    assert call_args[1]['content_type'] == "text/plain"
+    assert isinstance(result, str)
+    assert result.endswith("test_file.txt")
 
 
 @pytest.mark.asyncio
-async def test_upload_file_404_error(mock_file):
+async def test_upload_file_404_error(mock_file, mock_storage):
     """Test handling of 404 error during upload."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
 
-    # Create a 404 error
-    error = ClientResponseError(
-        status=404,
-        message="Not Found",
-        request_info=MagicMock(),
-        history=()
-    )
-
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.upload = AsyncMock(side_effect=error)
-        mock_session.return_value.__aenter__.return_value = mock_session
+    mock_storage.upload.side_effect = ERROR_404
 
-        # Should return filename without raising error
-        result = await upload_file('my_bucket', path, mock_file, user_id)
-        assert result.endswith("test_file.txt")
+    # Should return filename without raising error
+    result = await upload_file('my_bucket', path, mock_file, user_id)
+    assert result.endswith("test_file.txt")
 
 
 @pytest.mark.asyncio
-async def test_upload_file_auth_error(mock_file):
+async def test_upload_file_auth_error(mock_file, mock_storage):
     """Test handling of authentication error during upload."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
 
-    # Create an auth error
-    error = ClientResponseError(
-        status=400,
-        message="invalid_grant",
-        request_info=MagicMock(),
-        history=()
-    )
-
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.upload = AsyncMock(side_effect=error)
-        mock_session.return_value.__aenter__.return_value = mock_session
+    mock_storage.upload.side_effect = ERROR_AUTH
 
-        with pytest.raises(ServerError) as exc_info:
-            await upload_file('my_bucket', path, mock_file, user_id)
-        assert "Authentication error" in str(exc_info.value)
+    with pytest.raises(ServerError) as exc_info:
+        await upload_file('my_bucket', path, mock_file, user_id)
+    assert "Authentication error" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_upload_file_other_error(mock_file):
+async def test_upload_file_other_error(mock_file, mock_storage):
     """Test handling of other errors during upload."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
@@ -119,61 +97,40 @@ async def test_upload_file_other_error(mock_file):
     # Create a generic error
     error = Exception("Generic error")
 
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.upload = AsyncMock(side_effect=error)
-        mock_session.return_value.__aenter__.return_value = mock_session
+    mock_storage.upload.side_effect = error
 
-        with pytest.raises(StorageError) as exc_info:
-            await upload_file('my_bucket', path, mock_file, user_id)
-        assert "Failed to upload file" in str(exc_info.value)
+    with pytest.raises(StorageError) as exc_info:
+        await upload_file('my_bucket', path, mock_file, user_id)
+    assert "Failed to upload file" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_delete_file_success():
+async def test_delete_file_success(mock_storage):
     """Test successful file deletion."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
     file_name = "test_file.txt"
 
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.delete = AsyncMock()
-        mock_session.return_value.__aenter__.return_value = mock_session
-
-        # Should complete without error
-        await delete_file('my_bucket', path, file_name, user_id)
-        mock_storage.delete.assert_called_once()
+    # Should complete without error
+    await delete_file('my_bucket', path, file_name, user_id)
+    mock_storage.delete.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_delete_file_404_error():
+async def test_delete_file_404_error(mock_storage):
     """Test handling of 404 error during deletion."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
     file_name = "test_file.txt"
 
-    error = ClientResponseError(
-        status=404,
-        message="Not Found",
-        request_info=MagicMock(),
-        history=()
-    )
-
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.delete = AsyncMock(side_effect=error)
-        mock_session.return_value.__aenter__.return_value = mock_session
+    mock_storage.delete.side_effect = ERROR_404
 
-        # Should complete without error for 404
-        await delete_file('my_bucket', path, file_name, user_id)
+    # Should complete without error for 404
+    await delete_file('my_bucket', path, file_name, user_id)
 
 
 @pytest.mark.asyncio
-async def test_delete_file_other_error():
+async def test_delete_file_other_error(mock_storage):
     """Test handling of other errors during deletion."""
     user_id = UUID('12345678-1234-5678-1234-567812345678')
     path = "test_path"
@@ -181,15 +138,11 @@ async def test_delete_file_other_error():
 
     error = Exception("Generic error")
 
-    with patch('aiohttp.ClientSession') as mock_session, \
-            patch('app.core.storage.Storage') as MockStorage:
-        mock_storage = MockStorage.return_value
-        mock_storage.delete = AsyncMock(side_effect=error)
-        mock_session.return_value.__aenter__.return_value = mock_session
+    mock_storage.delete.side_effect = error
 
-        with pytest.raises(StorageError) as exc_info:
-            await delete_file('my_bucket', path, file_name, user_id)
-        assert "Failed to delete file" in str(exc_info.value)
+    with pytest.raises(StorageError) as exc_info:
+        await delete_file('my_bucket', path, file_name, user_id)
+    assert "Failed to delete file" in str(exc_info.value)
 
 
 def test_handle_gcs_error():
@@ -197,32 +150,44 @@ def test_handle_gcs_error():
     file_path = "test/path/file.txt"
 
     # Test 404 error
-    error_404 = ClientResponseError(
-        status=404,
-        message="Not Found",
-        request_info=MagicMock(),
-        history=()
-    )
-    handle_gcs_error(error_404, file_path)  # Should not raise
+    handle_gcs_error(ERROR_404, file_path)  # Should not raise
 
     # Test auth error
-    error_auth = ClientResponseError(
-        status=400,
-        message="invalid_grant",
-        request_info=MagicMock(),
-        history=()
-    )
     with pytest.raises(ServerError) as exc_info:
-        handle_gcs_error(error_auth, file_path)
+        handle_gcs_error(ERROR_AUTH, file_path)
     assert "Authentication error" in str(exc_info.value)
 
     # Test other error
-    error_other = ClientResponseError(
-        status=500,
-        message="Internal Server Error",
-        request_info=MagicMock(),
-        history=()
-    )
     with pytest.raises(StorageError) as exc_info:
-        handle_gcs_error(error_other, file_path)
+        handle_gcs_error(ERROR_500, file_path)
     assert "GCS operation failed" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_shared_storage_reused_and_closed():
+    """Test that the shared GCS client is reused until it's closed."""
+    await close_storage()
+
+    storage = get_storage()
+    assert get_storage() is storage
+
+    await close_storage()
+    assert storage.session.session.closed
+    assert get_storage() is not storage
+
+    await close_storage()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_storage():
+    """Test that the shared GCS client's token is fetched, and failures don't raise."""
+    mock_storage = MagicMock(spec=Storage)
+    mock_storage.token = AsyncMock()
+    mock_storage.token.get = AsyncMock(side_effect=Exception("No credentials"))
+
+    with patch('app.core.storage.get_storage', return_value=mock_storage), \
+            patch('app.core.storage.logger') as mock_logger:
+        await warm_up_storage()
+
+        mock_storage.token.get.assert_awaited_once()
+        mock_logger.warning.assert_called_once()
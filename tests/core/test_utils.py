@@ -1,112 +1,68 @@
 import json
-
-from app.core.utils import recursive_json_decode
+import logging
+
+import pytest
+
+from app.core.utils import recursive_json_decode, setup_logger
+
+# Complex nested structure with mixed content, encoded once
+COMPLEX_DATA = {
+    "string": "plain text",
+    "encoded_dict": json.dumps({"key": "value"}),
+    "list_mixed": [
+        json.dumps({"item": 1}),
+        "plain",
+        json.dumps([1, 2, 3])
+    ],
+    "nested_dict": {
+        "encoded": json.dumps({"deep": "value"}),
+        "plain": "text"
+    }
+}
 
 
-def test_recursive_json_decode_basic():
-    """Test basic JSON decoding."""
+@pytest.mark.parametrize("value,expected", [
     # Simple string
-    assert recursive_json_decode('{"key": "value"}') == {"key": "value"}
-
+    ('{"key": "value"}', {"key": "value"}),
     # Nested structure
-    nested = '{"outer": {"inner": "value"}}'
-    assert recursive_json_decode(nested) == {"outer": {"inner": "value"}}
-
+    ('{"outer": {"inner": "value"}}', {"outer": {"inner": "value"}}),
     # Array
-    array = '[1, 2, 3]'
-    assert recursive_json_decode(array) == [1, 2, 3]
-
-
-def test_recursive_json_decode_nested():
-    """Test nested JSON decoding."""
-    # Deeply nested structure
-    nested = json.dumps({
-        "level1": json.dumps({
-            "level2": json.dumps({
-                "level3": "value"
-            })
-        })
-    })
-
-    expected = {
-        "level1": {
-            "level2": {
-                "level3": "value"
-            }
-        }
-    }
-
-    assert recursive_json_decode(nested) == expected
-
-
-def test_recursive_json_decode_mixed():
-    """Test mixed content JSON decoding."""
+    ('[1, 2, 3]', [1, 2, 3]),
+    # Deeply nested encoded structure
+    (
+        json.dumps({"level1": json.dumps({"level2": json.dumps({"level3": "value"})})}),
+        {"level1": {"level2": {"level3": "value"}}}
+    ),
     # Mix of encoded and non-encoded data
-    mixed = {
-        "encoded": json.dumps({"key": "value"}),
-        "plain": "text",
-        "number": 42,
-        "list": json.dumps([1, 2, 3])
-    }
-
-    expected = {
-        "encoded": {"key": "value"},
-        "plain": "text",
-        "number": 42,
-        "list": [1, 2, 3]
-    }
-
-    assert recursive_json_decode(mixed) == expected
-
-
-def test_recursive_json_decode_invalid():
-    """Test invalid JSON handling."""
+    (
+        {"encoded": json.dumps({"key": "value"}), "plain": "text", "number": 42, "list": json.dumps([1, 2, 3])},
+        {"encoded": {"key": "value"}, "plain": "text", "number": 42, "list": [1, 2, 3]}
+    ),
     # Invalid JSON string should be returned as-is
-    invalid = "Not a JSON string"
-    assert recursive_json_decode(invalid) == invalid
-
+    ("Not a JSON string", "Not a JSON string"),
     # Partially invalid structure
-    partial = {
-        "valid": json.dumps({"key": "value"}),
-        "invalid": "Not JSON"
-    }
-
-    result = recursive_json_decode(partial)
-    assert result["valid"] == {"key": "value"}
-    assert result["invalid"] == "Not JSON"
-
-
-def test_recursive_json_decode_special_types():
-    """Test JSON decoding with special types."""
-    # Test with None
-    assert recursive_json_decode(None) is None
-
-    # Test with numbers
-    assert recursive_json_decode(42) == 42
-    assert recursive_json_decode(3.14) == 3.14
-
-    # Test with boolean
-    assert recursive_json_decode(True) is True
-    assert recursive_json_decode(False) is False
+    (
+        {"valid": json.dumps({"key": "value"}), "invalid": "Not JSON"},
+        {"valid": {"key": "value"}, "invalid": "Not JSON"}
+    ),
+    # Special types
+    (None, None),
+    (42, 42),
+    (3.14, 3.14),
+    (True, True),
+    (False, False),
+])
+def test_recursive_json_decode(value, expected):
+    """Test JSON decoding of plain, encoded, nested, invalid and special values."""
+    result = recursive_json_decode(value)
+    assert result == expected
+    # Ex. `True == 1`, so check the type too
+    assert type(result) is type(expected)
 
 
 def test_recursive_json_decode_complex_nested():
     """Test complex nested structures with mixed content."""
-    complex_data = {
-        "string": "plain text",
-        "encoded_dict": json.dumps({"key": "value"}),
-        "list_mixed": [
-            json.dumps({"item": 1}),
-            "plain",
-            json.dumps([1, 2, 3])
-        ],
-        "nested_dict": {
-            "encoded": json.dumps({"deep": "value"}),
-            "plain": "text"
-        }
-    }
-
-    result = recursive_json_decode(complex_data)
+    result = recursive_json_decode(COMPLEX_DATA)
 
     assert result["string"] == "plain text"
     assert result["encoded_dict"] == {"key": "value"}
@@ -115,3 +71,14 @@ def test_recursive_json_decode_complex_nested():
     assert result["list_mixed"][2] == [1, 2, 3]
     assert result["nested_dict"]["encoded"] == {"deep": "value"}
     assert result["nested_dict"]["plain"] == "text"
+
+
+def test_setup_logger_reused():
+    """Test that setting up a logger again doesn't add more handlers."""
+    logger = setup_logger("test_setup_logger_reused")
+    handler_count = len(logger.handlers)
+
+    # Same arguments return the cached logger; different ones reuse its handler
+    assert setup_logger("test_setup_logger_reused") is logger
+    setup_logger("test_setup_logger_reused", log_level=logging.DEBUG)
+    assert len(logger.handlers) == handler_count == 1
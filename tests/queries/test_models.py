@@ -0,0 +1,26 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.queries.common import now_utc
+from app.queries.models import stream_deleted_model_weights
+
+
+def compile_query(query) -> str:
+    """Compile a query to PostgreSQL SQL."""
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_stream_deleted_model_weights_locks_models(mock_db):
+    """Test that the models streamed for cleanup are locked, skipping those locked by other workers."""
+    async def stream(*args):
+        yield MagicMock()
+
+    mock_db.stream = AsyncMock(return_value=stream())
+
+    rows = [row async for row in stream_deleted_model_weights(mock_db, now_utc())]
+
+    assert len(rows) == 1
+    assert "FOR UPDATE SKIP LOCKED" in compile_query(mock_db.stream.await_args[0][0])
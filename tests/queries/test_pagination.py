@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+from app.queries.common import paginate_query
+from app.schemas.common import Pagination, PaginationWithoutTotal
+
+
+class PaginationBase(DeclarativeBase):
+    """Throwaway declarative base, so the test table isn't added to the application's metadata."""
+
+
+class Item(PaginationBase):
+    __tablename__ = 'items'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    color = Column(String, nullable=False)
+
+
+@pytest.fixture
+async def db():
+    """Create an in-memory SQLite database with 5 items."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(PaginationBase.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all([Item(id=i, name=f"item-{i}", color="red") for i in range(1, 6)])
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_paginate_entity_select(db):
+    """Test that an entity select returns model objects, and the total."""
+    items, pagination = await paginate_query(db, select(Item).order_by(Item.id), 1, 2)
+
+    assert all(isinstance(item, Item) for item in items)
+    assert [item.id for item in items] == [1, 2]
+    assert pagination.total_pages == 3
+
+
+@pytest.mark.asyncio
+async def test_paginate_single_column_select(db):
+    """Test that a single column select returns plain values."""
+    items, pagination = await paginate_query(db, select(Item.name).order_by(Item.id), 3, 2)
+
+    assert items == ["item-5"]
+    assert pagination.total_pages == 3
+
+
+@pytest.mark.asyncio
+async def test_paginate_multi_column_select(db):
+    """Test that a multi column select returns rows with named columns, without the count column."""
+    items, pagination = await paginate_query(db, select(Item.id, Item.name).order_by(Item.id), 1, 2)
+
+    assert [tuple(item) for item in items] == [(1, "item-1"), (2, "item-2")]
+    assert items[0].name == "item-1"
+    assert pagination == Pagination(total_pages=3, current_page=1, items_per_page=2)
+
+
+@pytest.mark.asyncio
+async def test_paginate_out_of_range(db):
+    """Test that a page past the end is empty, and still reports the total."""
+    items, pagination = await paginate_query(db, select(Item).order_by(Item.id), 4, 2)
+
+    assert items == []
+    assert pagination.total_pages == 3
+
+
+@pytest.mark.asyncio
+async def test_paginate_without_total_entity_select(db):
+    """Test that an entity select without the total returns model objects, trimmed to the page size."""
+    items, pagination = await paginate_query(db, select(Item).order_by(Item.id), 1, 2, include_total=False)
+
+    assert all(isinstance(item, Item) for item in items)
+    assert [item.id for item in items] == [1, 2]
+    assert isinstance(pagination, PaginationWithoutTotal)
+    assert pagination.has_next is True
+
+
+@pytest.mark.asyncio
+async def test_paginate_without_total_last_page(db):
+    """Test that the last page without the total reports no next page."""
+    items, pagination = await paginate_query(db, select(Item.name).order_by(Item.id), 3, 2, include_total=False)
+
+    assert items == ["item-5"]
+    assert isinstance(pagination, PaginationWithoutTotal)
+    assert pagination.has_next is False
+
+
+@pytest.mark.asyncio
+async def test_paginate_without_total_full_last_page(db):
+    """Test that a full last page without the total reports no next page."""
+    items, pagination = await paginate_query(
+        db, select(Item.id, Item.name).order_by(Item.id), 1, 5, include_total=False
+    )
+
+    assert [tuple(item) for item in items] == [(i, f"item-{i}") for i in range(1, 6)]
+    assert pagination.has_next is False
@@ -8,6 +8,7 @@ from starlette.requests import Request
 
 from app.core.constants import BillingTransactionType
 from app.services.auth0 import Auth0Service
+from app.services.user import create_stripe_customer_task
 
 
 @pytest.fixture
@@ -169,6 +170,45 @@ async def test_handle_callback_new_user(auth0_service, mock_request, mock_db):
         )
 
 
+@pytest.mark.asyncio
+async def test_handle_callback_new_user_background_stripe_customer(auth0_service, mock_request, mock_db):
+    """Test that a new user's Stripe customer is created after the response is sent."""
+    user_info = {
+        "email": "new@example.com",
+        "name": "New User",
+        "sub": "auth0|456",
+        "email_verified": True
+    }
+    auth0_service.oauth.auth0.authorize_access_token = AsyncMock(return_value={"userinfo": user_info})
+    mock_user = MagicMock(id=uuid4(), email="new@example.com")
+    background_tasks = MagicMock()
+
+    with patch('app.services.auth0.user_queries.get_user_by_email', AsyncMock(return_value=None)), \
+            patch('app.services.auth0.add_credits_to_user', AsyncMock()), \
+            patch('app.services.auth0.User', return_value=mock_user):
+        await auth0_service.handle_callback(mock_request, mock_db, background_tasks)
+
+    background_tasks.add_task.assert_called_once_with(create_stripe_customer_task, mock_user.id)
+
+
+@pytest.mark.asyncio
+async def test_handle_callback_existing_user_no_background_tasks(auth0_service, mock_request, mock_db):
+    """Test that an existing user doesn't get a Stripe customer task."""
+    user_info = {
+        "email": "test@example.com",
+        "name": "Test User",
+        "sub": "auth0|123",
+        "email_verified": True
+    }
+    auth0_service.oauth.auth0.authorize_access_token = AsyncMock(return_value={"userinfo": user_info})
+    mock_user = MagicMock(id=uuid4(), email="test@example.com", email_verified=True)
+    background_tasks = MagicMock()
+
+    with patch('app.services.auth0.user_queries.get_user_by_email', AsyncMock(return_value=mock_user)):
+        await auth0_service.handle_callback(mock_request, mock_db, background_tasks)
+
+    background_tasks.add_task.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_handle_callback_missing_user_info(auth0_service, mock_request, mock_db):
     """Test callback handling with missing user info."""
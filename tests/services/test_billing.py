@@ -102,6 +102,7 @@ async def test_add_manual_credits_success(mock_db, mock_user, credit_add_request
         assert result.transaction_type == BillingTransactionType.MANUAL_ADJUSTMENT
         mock_db.add.assert_called_once()
         mock_db.commit.assert_awaited_once()
+        mock_db.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -10,7 +10,7 @@ from app.queries.common import now_utc, make_naive
 from app.services.fine_tuned_model import (
     get_fine_tuned_models,
     get_fine_tuned_model,
-    create_fine_tuned_model
+    create_fine_tuned_models_bulk
 )
 
 
@@ -92,95 +92,26 @@ async def test_get_fine_tuned_model_not_found(mock_db, mock_user_id):
 
 
 @pytest.mark.asyncio
-async def test_create_fine_tuned_model_success(mock_db, mock_user_id, mock_job_id):
-    """Test successful fine-tuned model creation."""
-    # Mock artifacts
-    artifacts = {"weights": "model.pt"}
-
-    # Mock job and queries
+async def test_create_fine_tuned_models_bulk(mock_db, mock_user_id, mock_job_id):
+    """Test creating fine-tuned models for many jobs at once."""
     mock_job = MagicMock()
     mock_job.id = mock_job_id
     mock_job.name = "test-job"
     mock_job.user_id = mock_user_id
-
-    with patch('app.services.fine_tuned_model.ft_models_queries') as mock_ft_queries, \
-            patch('app.services.fine_tuned_model.ft_jobs_queries') as mock_ft_job_queries:
-        # Configure mocks
-        mock_ft_queries.get_existing_model = AsyncMock(return_value=None)
-        mock_ft_queries.create_model = AsyncMock()
-        mock_ft_job_queries.get_job_by_id = AsyncMock(return_value=mock_job)
-
-        # Call function
-        result = await create_fine_tuned_model(mock_db, mock_job_id, mock_user_id, artifacts)
-
-        # Verify results
-        assert result is True
-        mock_ft_queries.create_model.assert_awaited_once_with(
-            mock_db,
-            mock_job_id,
-            mock_user_id,
-            "test-job_model",
-            artifacts
-        )
-        mock_db.commit.assert_awaited_once()
-
-
-@pytest.mark.asyncio
-async def test_create_fine_tuned_model_existing(mock_db, mock_user_id, mock_job_id, mock_fine_tuned_model):
-    """Test model creation when model already exists."""
-    artifacts = {"weights": "model.pt"}
-
-    # Mock job and queries
-    mock_job = MagicMock()
-    mock_job.id = mock_job_id
-    mock_job.name = "test-job"
-    mock_job.user_id = mock_user_id
-
-    with patch('app.services.fine_tuned_model.ft_models_queries') as mock_ft_queries, \
-            patch('app.services.fine_tuned_model.ft_jobs_queries') as mock_ft_job_queries:
-        mock_ft_queries.get_existing_model = AsyncMock(return_value=mock_fine_tuned_model)
-        mock_ft_queries.create_model = AsyncMock()
-        mock_ft_job_queries.get_job_by_id = AsyncMock(return_value=mock_job)
-
-        result = await create_fine_tuned_model(mock_db, mock_job_id, mock_user_id, artifacts)
-
-        assert result is True
-        mock_ft_queries.create_model.assert_not_awaited()
-        mock_db.commit.assert_not_awaited()
-
-
-
-@pytest.mark.asyncio
-async def test_create_fine_tuned_model_job_not_found(mock_db, mock_user_id, mock_job_id):
-    """Test model creation when job not found."""
     artifacts = {"weights": "model.pt"}
+    model_id = uuid4()
 
-    with patch('app.services.fine_tuned_model.ft_jobs_queries') as mock_queries:
-        mock_queries.get_job_by_id = AsyncMock(return_value=None)
+    with patch('app.services.fine_tuned_model.ft_models_queries') as mock_ft_queries:
+        mock_ft_queries.create_models_bulk = AsyncMock(return_value=[model_id])
 
-        result = await create_fine_tuned_model(mock_db, mock_job_id, mock_user_id, artifacts)
+        result = await create_fine_tuned_models_bulk(mock_db, [(mock_job, artifacts)])
 
-        assert result is False
+        # Verify a single insert is issued, and committing is left to the caller
+        assert result == [model_id]
+        mock_ft_queries.create_models_bulk.assert_awaited_once_with(mock_db, [{
+            "user_id": mock_user_id,
+            "fine_tuning_job_id": mock_job_id,
+            "name": "test-job_model",
+            "artifacts": artifacts
+        }])
         mock_db.commit.assert_not_awaited()
-
-
-@pytest.mark.asyncio
-async def test_create_fine_tuned_model_error(mock_db, mock_user_id, mock_job_id):
-    """Test model creation with error."""
-    artifacts = {"weights": "model.pt"}
-    mock_job = MagicMock()
-    mock_job.id = mock_job_id
-    mock_job.name = "test-job"
-    mock_job.user_id = mock_user_id
-
-    with patch('app.services.fine_tuned_model.ft_models_queries') as mock_ft_queries, \
-            patch('app.services.fine_tuned_model.ft_jobs_queries') as mock_ft_job_queries:
-        # Configure mocks
-        mock_ft_queries.get_existing_model = AsyncMock(return_value=None)
-        mock_ft_queries.create_model = AsyncMock(side_effect=Exception("Database error"))
-        mock_ft_job_queries.get_job_by_id = AsyncMock(return_value=mock_job)
-
-        result = await create_fine_tuned_model(mock_db, mock_job_id, mock_user_id, artifacts)
-
-        assert result is False
-        mock_db.rollback.assert_awaited_once()
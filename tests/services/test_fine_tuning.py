@@ -304,6 +304,24 @@ async def test_update_job_progress_success(mock_db, mock_job):
     mock_db.commit.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_update_job_progress_no_commit(mock_db, mock_job):
+    """Test job progress update that leaves committing to the caller."""
+    progress = {
+        "current_step": 100,
+        "total_steps": 1000,
+        "current_epoch": 1,
+        "total_epochs": 3
+    }
+    mock_job.current_step = 90
+
+    result = await update_job_progress(mock_db, mock_job, progress, commit=False)
+
+    assert result is True
+    assert mock_job.current_step == 100
+    mock_db.commit.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_get_jobs_for_status_update(mock_db, mock_job):
     """Test retrieving jobs for status update."""
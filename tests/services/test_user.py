@@ -1,6 +1,6 @@
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -11,7 +11,8 @@ from app.schemas.user import UserUpdate
 from app.services.user import (
     update_user,
     deactivate_user,
-    create_user
+    create_user,
+    create_stripe_customer_task
 )
 
 
@@ -30,6 +31,18 @@ def mock_user():
     return user
 
 
+@pytest.fixture
+def mock_insert_user():
+    """Patch the user insert query to build the new user locally."""
+
+    async def insert_user(db, name, email, auth0_user_id, email_verified):
+        return User(id=uuid4(), name=name, email=email,
+                    auth0_user_id=auth0_user_id, email_verified=email_verified)
+
+    with patch('app.services.user.user_queries.create_user', AsyncMock(side_effect=insert_user)) as mock_insert:
+        yield mock_insert
+
+
 @pytest.mark.asyncio
 async def test_update_user_success(mock_db, mock_user):
     """Test successful user update."""
@@ -50,6 +63,23 @@ async def test_update_user_success(mock_db, mock_user):
         mock_queries.get_user_by_id.assert_awaited_once_with(mock_db, user_id)
 
 
+@pytest.mark.asyncio
+async def test_update_user_no_changes(mock_db, mock_user):
+    """Test that an empty user update skips the database write."""
+    user_id = UUID('12345678-1234-5678-1234-567812345678')
+    user_update = UserUpdate()
+
+    with patch('app.services.user.user_queries') as mock_queries:
+        mock_queries.get_user_by_id = AsyncMock(return_value=mock_user)
+
+        result = await update_user(mock_db, user_id, user_update)
+
+        # Verify the current user was returned without a commit
+        assert result.name == mock_user.name
+        mock_db.commit.assert_not_awaited()
+        mock_db.refresh.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_update_user_not_found(mock_db):
     """Test updating non-existent user."""
@@ -95,7 +125,7 @@ async def test_deactivate_user_not_found(mock_db):
 
 
 @pytest.mark.asyncio
-async def test_create_user_success(mock_db):
+async def test_create_user_success(mock_db, mock_insert_user):
     """Test successful user creation."""
     name = "New User"
     email = "new@example.com"
@@ -117,9 +147,9 @@ async def test_create_user_success(mock_db):
         assert result.email_verified == email_verified
 
         # Verify database operations
-        mock_db.add.assert_called_once()
+        mock_insert_user.assert_awaited_once_with(mock_db, name, email, auth0_user_id, email_verified)
         mock_db.commit.assert_awaited_once()
-        mock_db.refresh.assert_awaited_once()
+        mock_db.refresh.assert_not_awaited()
 
         # Verify credits were added and Stripe customer was created
         mock_add_credits.assert_awaited_once_with(
@@ -133,14 +163,29 @@ async def test_create_user_success(mock_db):
 
 
 @pytest.mark.asyncio
-async def test_create_user_no_credits(mock_db):
+async def test_create_user_background_stripe_customer(mock_db, mock_insert_user):
+    """Test that the Stripe customer is created in the background when possible."""
+    background_tasks = MagicMock()
+
+    with patch('app.services.user.add_credits_to_user'), \
+            patch('app.services.user.create_stripe_customer') as mock_create_stripe:
+        result = await create_user(mock_db, "New User", "new@example.com", "auth0|123", True,
+                                   background_tasks=background_tasks)
+
+        # Verify Stripe customer creation was deferred
+        mock_create_stripe.assert_not_awaited()
+        background_tasks.add_task.assert_called_once_with(create_stripe_customer_task, result.id)
+
+
+@pytest.mark.asyncio
+async def test_create_user_no_credits(mock_db, mock_insert_user):
     """Test user creation with new_user_credits set to 0."""
     name = "New User"
     email = "new@example.com"
     auth0_user_id = "auth0|123"
     email_verified = True
 
-    with patch('app.services.user.config.new_user_credits', 0), \
+    with patch('app.services.user.NEW_USER_CREDITS', 0), \
             patch('app.services.user.add_credits_to_user') as mock_add_credits, \
             patch('app.services.user.create_stripe_customer') as mock_create_stripe:
         mock_create_stripe.return_value = None
@@ -158,7 +203,7 @@ async def test_create_user_no_credits(mock_db):
 
 
 @pytest.mark.asyncio
-async def test_create_user_error(mock_db):
+async def test_create_user_error(mock_db, mock_insert_user):
     """Test user creation with database error."""
     name = "New User"
     email = "new@example.com"
@@ -175,3 +220,34 @@ async def test_create_user_error(mock_db):
 
         assert "Database error" in str(exc_info.value)
         mock_db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_stripe_customer_task(mock_user):
+    """Test that the background task creates the Stripe customer in its own session."""
+    task_db = AsyncMock()
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = task_db
+
+    with patch('app.services.user.AsyncSessionLocal', session_factory), \
+            patch('app.services.user.user_queries.get_user_by_id', AsyncMock(return_value=mock_user)) as mock_get_user, \
+            patch('app.services.user.create_stripe_customer') as mock_create_stripe:
+        await create_stripe_customer_task(mock_user.id)
+
+        session_factory.assert_called_once_with()
+        mock_get_user.assert_awaited_once_with(task_db, mock_user.id)
+        mock_create_stripe.assert_awaited_once_with(task_db, mock_user)
+
+
+@pytest.mark.asyncio
+async def test_create_stripe_customer_task_user_not_found():
+    """Test that the background task skips users deleted before it ran."""
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = AsyncMock()
+
+    with patch('app.services.user.AsyncSessionLocal', session_factory), \
+            patch('app.services.user.user_queries.get_user_by_id', AsyncMock(return_value=None)), \
+            patch('app.services.user.create_stripe_customer') as mock_create_stripe:
+        await create_stripe_customer_task(uuid4())
+
+        mock_create_stripe.assert_not_awaited()
@@ -1,64 +1,121 @@
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 
 from app.core.constants import FineTuningJobStatus
+from app.models.fine_tuned_model import FineTunedModel
+from app.models.fine_tuning_job import FineTuningJob
+from app.models.fine_tuning_job_detail import FineTuningJobDetail
 # noinspection PyProtectedMember
 from app.tasks.job_status_updater import (
     update_job_statuses,
     _get_jobs_for_update,
     _group_jobs_by_user,
+    _map_jobs_by_user,
     _update_job_group,
+    _fetch_jobs_bulk,
+    _stream_job_groups,
     _process_job_update,
     _update_job_timestamps,
-    _update_job_steps,
-    _check_create_model
+    _process_artifacts
 )
 
 
 @pytest.fixture
 def mock_job():
-    """Create a mock fine-tuning job."""
-    job = MagicMock()
-    job.id = UUID('12345678-1234-5678-1234-567812345678')
-    job.user_id = UUID('98765432-9876-5432-9876-987654321098')
-    job.status = FineTuningJobStatus.RUNNING
-    job.current_step = 50
-    job.total_steps = 100
-    job.current_epoch = 1
-    job.total_epochs = 3
-    return job
+    """Create a fine-tuning job; a real model, since updates bypass ORM dirty tracking."""
+    return FineTuningJob(
+        id=UUID('12345678-1234-5678-1234-567812345678'),
+        user_id=UUID('98765432-9876-5432-9876-987654321098'),
+        status=FineTuningJobStatus.RUNNING,
+        current_step=50,
+        total_steps=100,
+        current_epoch=1,
+        total_epochs=3
+    )
 
 
 @pytest.fixture
 def mock_job_detail():
-    """Create a mock job detail."""
-    detail = MagicMock()
-    detail.timestamps = {}
-    detail.parameters = {"batch_size": 2, "epochs": 3}
-    return detail
+    """Create a job detail."""
+    return FineTuningJobDetail(
+        timestamps={},
+        parameters={"batch_size": 2, "epochs": 3}
+    )
 
 
 @pytest.mark.asyncio
 async def test_update_job_statuses(mock_db, mock_job):
     """Test the main job status update function."""
-    with patch('app.tasks.job_status_updater._get_jobs_for_update') as mock_get_jobs, \
+    job_updates = [{'job_id': str(mock_job.id), 'status': 'RUNNING'}]
+
+    async def mock_stream_jobs(*args, **kwargs):
+        yield mock_job
+
+    with patch('app.tasks.job_status_updater.ft_queries') as mock_queries, \
+            patch('app.tasks.job_status_updater.fetch_job_details') as mock_fetch, \
             patch('app.tasks.job_status_updater._update_job_group') as mock_update_group:
         # Mock jobs retrieval
-        mock_get_jobs.return_value = [mock_job]
+        mock_queries.stream_jobs_for_status_update = MagicMock(side_effect=mock_stream_jobs)
+        mock_fetch.return_value = job_updates
         mock_update_group.return_value = None
 
         await update_job_statuses(mock_db)
 
-        # Verify correct function calls
-        mock_get_jobs.assert_awaited_once_with(mock_db)
+        # Verify correct function calls; loaded jobs are passed along
+        mock_queries.stream_jobs_for_status_update.assert_called_once()
+        mock_fetch.assert_awaited_once_with(mock_job.user_id, [mock_job.id])
         mock_update_group.assert_awaited_once_with(
             mock_db,
             mock_job.user_id,
-            [mock_job.id]
+            job_updates,
+            {str(mock_job.id): mock_job}
         )
 
+        # Verify all groups are committed together
+        mock_db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_job_groups(mock_db, mock_job):
+    """Test that each user's job IDs are yielded once all their jobs are loaded."""
+    other_job = FineTuningJob(id=uuid4(), user_id=uuid4(), status=FineTuningJobStatus.RUNNING)
+    second_job = FineTuningJob(id=uuid4(), user_id=mock_job.user_id, status=FineTuningJobStatus.QUEUED)
+
+    async def mock_stream_jobs(*args, **kwargs):
+        for job in (mock_job, second_job, other_job):
+            yield job
+
+    with patch('app.tasks.job_status_updater.ft_queries') as mock_queries:
+        mock_queries.stream_jobs_for_status_update = MagicMock(side_effect=mock_stream_jobs)
+
+        jobs = []
+        groups = [group async for group in _stream_job_groups(mock_db, jobs)]
+
+        # Verify jobs are grouped by user, and collected for the caller
+        assert groups == [
+            (mock_job.user_id, [mock_job.id, second_job.id]),
+            (other_job.user_id, [other_job.id])
+        ]
+        assert jobs == [mock_job, second_job, other_job]
+
+
+@pytest.mark.asyncio
+async def test_fetch_jobs_bulk(mock_job):
+    """Test fetching updates for all jobs with a single scheduler request."""
+    job_update = {"job_id": str(mock_job.id), "status": "RUNNING"}
+    unknown_update = {"job_id": "unknown-job", "status": "RUNNING"}
+
+    with patch('app.tasks.job_status_updater.fetch_job_details_bulk') as mock_fetch:
+        mock_fetch.return_value = [job_update, unknown_update]
+
+        result = await _fetch_jobs_bulk({mock_job.user_id: [mock_job.id]}, [mock_job])
+
+        # Verify only the known job is kept, grouped by its owner
+        mock_fetch.assert_awaited_once_with({mock_job.user_id: [mock_job.id]})
+        assert result == {mock_job.user_id: [job_update]}
+
 
 @pytest.mark.asyncio
 async def test_get_jobs_for_update(mock_db):
@@ -84,6 +141,17 @@ def test_group_jobs_by_user(mock_job):
     assert result[mock_job.user_id] == [mock_job.id]
 
 
+def test_map_jobs_by_user(mock_job):
+    """Test mapping each user's jobs by job ID."""
+    other_job = FineTuningJob(id=uuid4(), user_id=uuid4(), status=FineTuningJobStatus.RUNNING)
+    result = _map_jobs_by_user([mock_job, other_job])
+
+    assert result == {
+        mock_job.user_id: {str(mock_job.id): mock_job},
+        other_job.user_id: {str(other_job.id): other_job},
+    }
+
+
 @pytest.mark.asyncio
 async def test_update_job_group_success(mock_db, mock_job):
     """Test successful update of a job group."""
@@ -98,17 +166,21 @@ async def test_update_job_group_success(mock_db, mock_job):
         'artifacts': {}
     }]
 
-    with patch('app.tasks.job_status_updater.fetch_job_details') as mock_fetch, \
-            patch('app.tasks.job_status_updater._process_job_update') as mock_process:
-        mock_fetch.return_value = job_updates
+    with patch('app.tasks.job_status_updater._process_job_update') as mock_process, \
+            patch('app.tasks.job_status_updater._write_job_changes') as mock_write, \
+            patch('app.tasks.job_status_updater.create_fine_tuned_models_bulk') as mock_create_models:
         mock_process.return_value = None
 
-        await _update_job_group(mock_db, user_id, job_ids)
+        await _update_job_group(mock_db, user_id, job_updates, {str(mock_job.id): mock_job})
 
-        # Verify interactions
-        mock_fetch.assert_awaited_once_with(user_id, job_ids)
-        mock_process.assert_awaited_once()
-        mock_db.commit.assert_awaited_once()
+        # Verify the job is looked up in memory, and changes are written in bulk
+        mock_process.assert_awaited_once_with(
+            mock_db, job_updates[0], user_id, {str(mock_job.id): mock_job}, [], [], []
+        )
+        mock_write.assert_awaited_once_with(mock_db, [], [])
+        mock_create_models.assert_awaited_once_with(mock_db, [])
+        mock_db.begin_nested.assert_called_once()
+        mock_db.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -131,22 +203,25 @@ async def test_process_job_update(mock_db, mock_job, mock_job_detail):
         }
     }
 
-    with patch('app.tasks.job_status_updater.ft_queries') as mock_queries, \
-            patch('app.tasks.job_status_updater._update_job_timestamps') as mock_update_timestamps, \
-            patch('app.tasks.job_status_updater._update_job_steps') as mock_update_steps, \
-            patch('app.tasks.job_status_updater._check_create_model') as mock_check_model:
-        # Configure mocks
-        mock_queries.get_job_by_id = AsyncMock(return_value=mock_job)
+    with patch('app.tasks.job_status_updater._update_job_timestamps') as mock_update_timestamps, \
+            patch('app.tasks.job_status_updater._process_artifacts') as mock_process_artifacts:
+        mock_job.details = mock_job_detail
+        job_map = {str(mock_job.id): mock_job}
+        status_changes = []
+        timestamp_changes = []
 
-        await _process_job_update(mock_db, update, mock_job.user_id)
+        await _process_job_update(
+            mock_db, update, mock_job.user_id, job_map, status_changes, timestamp_changes, []
+        )
 
-        # Verify job status was updated
+        # Verify job status was updated, and queued for the bulk write
         assert mock_job.status == FineTuningJobStatus.COMPLETED
+        assert status_changes == [{"id": mock_job.id, "status": "COMPLETED"}]
+        assert len(timestamp_changes) == 1
 
         # Verify all update functions were called
         mock_update_timestamps.assert_awaited_once()
-        mock_update_steps.assert_awaited_once()
-        mock_check_model.assert_awaited_once()
+        mock_process_artifacts.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -161,17 +236,21 @@ async def test_update_job_timestamps(mock_job, mock_job_detail):
     # Mock job details
     mock_job.details = mock_job_detail
 
-    await _update_job_timestamps(mock_job, timestamps)
+    changed = await _update_job_timestamps(mock_job, timestamps)
 
     # Verify timestamps were correctly mapped and stored
+    assert changed is True
     assert mock_job.details.timestamps.get('running') == timestamps['RUNNING']
     assert mock_job.details.timestamps.get('completed') == timestamps['COMPLETED']
     assert mock_job.details.timestamps.get('queued') == timestamps['WAIT_FOR_VM']
 
+    # Verify repeated timestamps aren't reported as changes
+    assert await _update_job_timestamps(mock_job, timestamps) is False
+
 
 @pytest.mark.asyncio
-async def test_update_job_steps(mock_db, mock_job):
-    """Test updating job progress steps."""
+async def test_process_artifacts_steps(mock_db, mock_job):
+    """Test updating job progress steps from artifacts."""
     artifacts = {
         'job_logger': [{
             'operation': 'step',
@@ -187,7 +266,7 @@ async def test_update_job_steps(mock_db, mock_job):
     # Mock job details
     mock_job.current_step = 50
 
-    await _update_job_steps(mock_db, mock_job, artifacts)
+    await _process_artifacts(mock_db, mock_job, artifacts, [])
 
     # Verify job progress was updated
     assert mock_job.current_step == 75
@@ -197,8 +276,8 @@ async def test_update_job_steps(mock_db, mock_job):
 
 
 @pytest.mark.asyncio
-async def test_check_create_model(mock_db, mock_job):
-    """Test checking and creating fine-tuned model."""
+async def test_process_artifacts_weights(mock_db, mock_job):
+    """Test creating fine-tuned model from artifacts."""
     artifacts = {
         'job_logger': [{
             'operation': 'weights',
@@ -209,15 +288,67 @@ async def test_check_create_model(mock_db, mock_job):
         }]
     }
 
-    with patch('app.tasks.job_status_updater.create_fine_tuned_model') as mock_create:
-        mock_create.return_value = True
+    model_requests = []
 
-        await _check_create_model(mock_db, mock_job.id, mock_job.user_id, artifacts)
+    await _process_artifacts(mock_db, mock_job, artifacts, model_requests)
 
-        # Verify model creation was attempted
-        mock_create.assert_awaited_once_with(
-            mock_db,
-            mock_job.id,
-            mock_job.user_id,
-            artifacts['job_logger'][0]['data']
-        )
+    # Verify model creation was queued
+    assert model_requests == [(mock_job, artifacts['job_logger'][0]['data'])]
+
+
+@pytest.mark.asyncio
+async def test_process_artifacts_latest_step_existing_model(mock_db, mock_job):
+    """Test that the latest step is used, and weights are skipped once the model exists."""
+    artifacts = {
+        'job_logger': [
+            {'operation': 'weights', 'data': {'weight_files': ['model.pt']}},
+            {'operation': 'step', 'data': {'step_num': 60, 'step_len': 100, 'epoch_num': 1, 'epoch_len': 3}},
+            {'operation': 'step', 'data': {'step_num': 80, 'step_len': 100, 'epoch_num': 2, 'epoch_len': 3}},
+        ]
+    }
+    mock_job.fine_tuned_model = FineTunedModel()
+
+    model_requests = []
+
+    await _process_artifacts(mock_db, mock_job, artifacts, model_requests)
+
+    # Verify progress comes from the latest step, and no model is queued
+    assert mock_job.current_step == 80
+    assert mock_job.current_epoch == 2
+    assert model_requests == []
+
+
+@pytest.mark.asyncio
+async def test_update_job_group_no_changes(mock_db, mock_job, mock_job_detail):
+    """Test that a poll with no changes doesn't write to the database."""
+    mock_job_detail.timestamps = {'running': '2024-01-01T00:01:00Z'}
+    mock_job.details = mock_job_detail
+    job_updates = [{
+        'job_id': str(mock_job.id),
+        'status': mock_job.status,
+        'timestamps': {'RUNNING': '2024-01-01T00:01:00Z'},
+        'artifacts': {}
+    }]
+
+    await _update_job_group(mock_db, mock_job.user_id, job_updates, {str(mock_job.id): mock_job})
+
+    # Verify no UPDATE statements were issued
+    mock_db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_process_artifacts_multiple_weights(mock_db, mock_job):
+    """Test that only the oldest weights record is used to create the model."""
+    artifacts = {
+        'job_logger': [
+            {'operation': 'weights', 'data': {'weight_files': ['epoch_0.pt']}},
+            {'operation': 'weights', 'data': {'weight_files': ['epoch_1.pt']}},
+        ]
+    }
+
+    model_requests = []
+
+    await _process_artifacts(mock_db, mock_job, artifacts, model_requests)
+
+    # Verify the model is queued once, from the oldest weights record
+    assert model_requests == [(mock_job, artifacts['job_logger'][0]['data'])]
@@ -1,41 +1,50 @@
+import asyncio
 from datetime import timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from gcloud.aio.storage import Storage
 
 from app.core.exceptions import StorageError
-from app.models.fine_tuned_model import FineTunedModel
 from app.queries.common import now_utc
 from app.tasks.model_cleanup import (
+    MAX_CONCURRENT_DELETES,
     cleanup_deleted_model_weights,
     _cleanup_model_weights,
-    _update_model_artifacts
+    _parse_base_url
 )
 
 
+def mock_stream(*models):
+    """Create a mock for `stream_deleted_model_weights` yielding the given models."""
+    async def stream(*args, **kwargs):
+        for model in models:
+            yield model
+    return MagicMock(side_effect=stream)
+
+
 @pytest.fixture
 def mock_model():
-    """Create a mock fine-tuned model."""
-    model = MagicMock(spec=FineTunedModel)
-    model.id = UUID('12345678-1234-5678-1234-567812345678')
-    model.artifacts = {
-        "base_url": "https://storage.googleapis.com/test-bucket/user123/job456",
-        "weight_files": ["model.pt", "optimizer.pt"]
-    }
-    return model
+    """Create a mock deleted model row, with the artifacts needed for cleanup."""
+    return SimpleNamespace(
+        id=UUID('12345678-1234-5678-1234-567812345678'),
+        base_url="https://storage.googleapis.com/test-bucket/user123/job456",
+        weight_files=["model.pt", "optimizer.pt"]
+    )
 
 
 @pytest.mark.asyncio
 async def test_cleanup_deleted_model_weights_success(mock_db, mock_model):
     """Test successful cleanup of deleted model weights."""
     with patch('app.tasks.model_cleanup.model_queries') as mock_queries, \
-            patch('app.tasks.model_cleanup.Storage') as MockStorage:
+            patch('app.tasks.model_cleanup.get_storage') as mock_get_storage:
         # Configure mocks
-        mock_queries.get_deleted_models = AsyncMock(return_value=[mock_model])
+        mock_queries.stream_deleted_model_weights = mock_stream(mock_model)
+        mock_queries.clear_model_weight_files = AsyncMock()
         mock_storage = AsyncMock(spec=Storage)
-        MockStorage.return_value = mock_storage
+        mock_get_storage.return_value = mock_storage
 
         # Configure storage mock to succeed
         mock_storage.delete = AsyncMock()
@@ -55,8 +64,8 @@ async def test_cleanup_deleted_model_weights_success(mock_db, mock_model):
             object_name="user123/job456/optimizer.pt"
         )
 
-        # Verify model artifacts were updated
-        assert mock_model.artifacts["weight_files"] == []
+        # Verify model artifacts were updated in bulk
+        mock_queries.clear_model_weight_files.assert_awaited_once_with(mock_db, [mock_model.id])
         mock_db.commit.assert_awaited_once()
 
 
@@ -67,13 +76,13 @@ async def test_cleanup_deleted_model_weights_no_models(mock_db):
     with patch('app.tasks.model_cleanup.model_queries') as mock_queries, \
             patch('app.tasks.model_cleanup.now_utc', return_value=now):
         # Configure mock to return no models
-        mock_queries.get_deleted_models = AsyncMock(return_value=[])
+        mock_queries.stream_deleted_model_weights = mock_stream()
 
         # Execute cleanup
         await cleanup_deleted_model_weights(mock_db)
 
         # Verify no operations were performed
-        mock_queries.get_deleted_models.assert_awaited_once_with(
+        mock_queries.stream_deleted_model_weights.assert_called_once_with(
             mock_db,
             now - timedelta(days=3)
         )
@@ -85,7 +94,7 @@ async def test_cleanup_deleted_model_weights_error(mock_db, mock_model):
     """Test error handling during cleanup."""
     with patch('app.tasks.model_cleanup.model_queries') as mock_queries:
         # Configure mocks
-        mock_queries.get_deleted_models = AsyncMock(side_effect=Exception("Database error"))
+        mock_queries.stream_deleted_model_weights = MagicMock(side_effect=Exception("Database error"))
 
         # Execute cleanup
         await cleanup_deleted_model_weights(mock_db)
@@ -98,67 +107,172 @@ async def test_cleanup_deleted_model_weights_error(mock_db, mock_model):
 async def test_cleanup_deleted_model_weights_invalid_url(mock_db, mock_model):
     """Test cleanup with invalid base_url format."""
     # Set invalid base URL
-    mock_model.artifacts["base_url"] = "invalid-url"
+    mock_model.base_url = "invalid-url"
 
     with patch('app.tasks.model_cleanup.model_queries') as mock_queries, \
             patch('app.tasks.model_cleanup.logger') as mock_logger:
-        mock_queries.get_deleted_models = AsyncMock(return_value=[mock_model])
+        mock_queries.stream_deleted_model_weights = mock_stream(mock_model)
 
         # Execute cleanup
         await cleanup_deleted_model_weights(mock_db)
 
-        # Verify error was logged
+        # Verify error was logged for the model, without failing the whole run
         mock_logger.error.assert_called_once()
+        mock_db.rollback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deleted_model_weights_one_model_fails(mock_db, mock_model):
+    """Test that a model that fails to clean up doesn't stop the other models' cleanup."""
+    invalid_model = SimpleNamespace(id=uuid4(), base_url="invalid-url", weight_files=["model.pt"])
+
+    with patch('app.tasks.model_cleanup.model_queries') as mock_queries, \
+            patch('app.tasks.model_cleanup.get_storage') as mock_get_storage, \
+            patch('app.tasks.model_cleanup.logger') as mock_logger:
+        mock_queries.stream_deleted_model_weights = mock_stream(invalid_model, mock_model)
+        mock_queries.clear_model_weight_files = AsyncMock()
+        mock_storage = AsyncMock(spec=Storage)
+        mock_storage.delete = AsyncMock()
+        mock_get_storage.return_value = mock_storage
+
+        await cleanup_deleted_model_weights(mock_db)
+
+        # Verify only the model that was cleaned up is updated
+        assert mock_storage.delete.await_count == 2
+        mock_queries.clear_model_weight_files.assert_awaited_once_with(mock_db, [mock_model.id])
+        mock_db.commit.assert_awaited_once()
+        mock_db.rollback.assert_not_awaited()
+        mock_logger.error.assert_called_once()
+        assert str(invalid_model.id) in mock_logger.error.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deleted_model_weights_model_limit(mock_db):
+    """Test that at most MAX_CONCURRENT_MODELS models are cleaned up at once, while they stream in."""
+    models = [SimpleNamespace(id=uuid4()) for _ in range(5)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def mock_cleanup(model, storage, semaphore):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return True
+
+    with patch('app.tasks.model_cleanup.model_queries') as mock_queries, \
+            patch('app.tasks.model_cleanup.get_storage'), \
+            patch('app.tasks.model_cleanup.MAX_CONCURRENT_MODELS', 2), \
+            patch('app.tasks.model_cleanup._cleanup_model_weights', side_effect=mock_cleanup):
+        mock_queries.stream_deleted_model_weights = mock_stream(*models)
+        mock_queries.clear_model_weight_files = AsyncMock()
+
+        await cleanup_deleted_model_weights(mock_db)
+
+        # Verify every model was cleaned up, without exceeding the limit
+        assert max_in_flight == 2
+        cleaned_model_ids = mock_queries.clear_model_weight_files.await_args[0][1]
+        assert sorted(cleaned_model_ids) == sorted(model.id for model in models)
 
 
 @pytest.mark.asyncio
 async def test_cleanup_model_weights_storage_error():
     """Test handling of storage errors in _cleanup_model_weights."""
-    mock_model = MagicMock(spec=FineTunedModel)
-    mock_model.artifacts = {
-        "base_url": "https://storage.googleapis.com/test-bucket/user123/job456",
-        "weight_files": ["model.pt"]
-    }
+    mock_model = SimpleNamespace(
+        id=UUID('12345678-1234-5678-1234-567812345678'),
+        base_url="https://storage.googleapis.com/test-bucket/user123/job456",
+        weight_files=["model.pt"]
+    )
     mock_storage = AsyncMock(spec=Storage)
     mock_storage.delete = AsyncMock(side_effect=StorageError("Storage error"))
 
     with patch('app.tasks.model_cleanup.logger') as mock_logger:
-        await _cleanup_model_weights(mock_model, mock_storage)
+        await _cleanup_model_weights(mock_model, mock_storage, asyncio.Semaphore(MAX_CONCURRENT_DELETES))
 
         assert mock_logger.error.called_once()
 
 
-def test_update_model_artifacts():
-    """Test updating model artifacts."""
-    artifacts = {
-        "base_url": "https://storage.googleapis.com/test-bucket/user123/job456",
-        "weight_files": ["model.pt", "optimizer.pt"],
-        "other_data": {"key": "value"}
-    }
-
-    updated = _update_model_artifacts(artifacts)
-
-    # Verify weight files are cleared but other data remains
-    assert updated["weight_files"] == []
-    assert updated["base_url"] == artifacts["base_url"]
-    assert updated["other_data"] == artifacts["other_data"]
-
-
 @pytest.mark.asyncio
 async def test_cleanup_model_weights_no_artifacts(mock_db, mock_model):
     """Test cleanup when model has no artifacts."""
-    mock_model.artifacts = None
+    mock_model.base_url = None
+    mock_model.weight_files = None
 
     with patch('app.tasks.model_cleanup.model_queries') as mock_queries, \
-            patch('app.tasks.model_cleanup.Storage') as MockStorage:
-        mock_queries.get_deleted_models = AsyncMock(return_value=[mock_model])
+            patch('app.tasks.model_cleanup.get_storage') as mock_get_storage:
+        mock_queries.stream_deleted_model_weights = mock_stream(mock_model)
+        mock_queries.clear_model_weight_files = AsyncMock()
         mock_storage = AsyncMock(spec=Storage)
-        MockStorage.return_value = mock_storage
+        mock_get_storage.return_value = mock_storage
 
         # Execute cleanup
         await cleanup_deleted_model_weights(mock_db)
 
-        # Verify no storage operations were attempted
+        # Verify no storage operations were attempted, and the model wasn't updated
         mock_storage.delete.assert_not_awaited()
-        # Verify transaction was still committed
-        mock_db.commit.assert_awaited_once()
+        mock_queries.clear_model_weight_files.assert_not_awaited()
+        # Verify there was nothing to commit
+        mock_db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_model_weights_concurrency_limit(mock_model):
+    """Test that weight files are deleted concurrently, up to the semaphore's limit."""
+    mock_model.weight_files = [f"epoch_{i}.pt" for i in range(10)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def mock_delete(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+
+    mock_storage = AsyncMock(spec=Storage)
+    mock_storage.delete = AsyncMock(side_effect=mock_delete)
+
+    cleaned = await _cleanup_model_weights(mock_model, mock_storage, asyncio.Semaphore(3))
+
+    # Verify every file was deleted, without exceeding the limit
+    assert cleaned is True
+    assert mock_storage.delete.await_count == 10
+    assert max_in_flight == 3
+
+
+def test_parse_base_url():
+    """Test parsing the bucket and path from weights base URLs."""
+    assert _parse_base_url("https://storage.googleapis.com/test-bucket/user123/job456") == \
+           ("test-bucket", "user123", "job456")
+    assert _parse_base_url("gs://test-bucket/user123/job456/") == ("test-bucket", "user123", "job456")
+    assert _parse_base_url("gs://test-bucket/user123/job456") == ("test-bucket", "user123", "job456")
+
+    with pytest.raises(ValueError):
+        _parse_base_url("invalid-url")
+
+
+@pytest.mark.asyncio
+async def test_cleanup_model_weights_already_cleaned(mock_model):
+    """Test that models without weight files aren't cleaned up again."""
+    mock_model.weight_files = []
+    mock_storage = AsyncMock(spec=Storage)
+
+    cleaned = await _cleanup_model_weights(mock_model, mock_storage, asyncio.Semaphore(MAX_CONCURRENT_DELETES))
+
+    assert cleaned is False
+    mock_storage.delete.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_model_weights_duplicates(mock_model):
+    """Test that duplicate weight files are only deleted once."""
+    mock_model.weight_files = ["model.pt", "model.pt", "optimizer.pt"]
+    mock_storage = AsyncMock(spec=Storage)
+    mock_storage.delete = AsyncMock()
+
+    with patch('app.tasks.model_cleanup.logger') as mock_logger:
+        await _cleanup_model_weights(mock_model, mock_storage, asyncio.Semaphore(MAX_CONCURRENT_DELETES))
+
+        assert mock_storage.delete.await_count == 2
+        mock_logger.warning.assert_called_once()
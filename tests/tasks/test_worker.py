@@ -0,0 +1,142 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+
+from app.tasks.worker import (
+    add_background_tasks,
+    shared_clients,
+    start_worker_process,
+    stop_worker_process,
+    supervise_worker_process
+)
+
+
+def test_add_background_tasks():
+    """Test that all background tasks are scheduled."""
+    scheduler = MagicMock()
+
+    with patch('app.tasks.worker.config', MagicMock(run_with_scheduler=True)):
+        add_background_tasks(scheduler)
+
+        assert scheduler.add_job.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_start_worker_process():
+    """Test that the worker process gets its own database pool size."""
+    mock_process = MagicMock(pid=1234)
+
+    with patch('app.tasks.worker.config', MagicMock(worker_db_pool_size=10)), \
+            patch('app.tasks.worker.asyncio.create_subprocess_exec') as mock_exec:
+        mock_exec.return_value = mock_process
+
+        process = await start_worker_process()
+
+        assert process is mock_process
+        env = mock_exec.call_args.kwargs['env']
+        assert env['CAPI_DB_POOL_SIZE'] == '10'
+        assert env['CAPI_DB_MAX_OVERFLOW'] == '0'
+
+
+@pytest.mark.asyncio
+async def test_stop_worker_process():
+    """Test that the worker process is terminated, and waited for."""
+    mock_process = MagicMock(pid=1234, returncode=None)
+    mock_process.wait = AsyncMock(return_value=-15)
+
+    with patch('app.tasks.worker.logger') as mock_logger:
+        await stop_worker_process(mock_process)
+
+    mock_process.terminate.assert_called_once()
+    mock_process.wait.assert_awaited_once()
+    assert "exit code: -15" in mock_logger.info.call_args[0][0]
+
+
+def mock_running_process(started: asyncio.Event) -> MagicMock:
+    """Create a mock worker process that runs until it's terminated."""
+    process = MagicMock(pid=2000, returncode=None)
+    exited = asyncio.Event()
+
+    async def wait():
+        started.set()
+        await exited.wait()
+        return -15
+
+    process.wait = AsyncMock(side_effect=wait)
+    process.terminate.side_effect = exited.set
+    return process
+
+
+@pytest.mark.asyncio
+async def test_supervise_worker_process_restarts():
+    """Test that a worker process that exits is logged and restarted, with backoff, until cancelled."""
+    started = asyncio.Event()
+    crashed_processes = [MagicMock(pid=1000 + i, wait=AsyncMock(return_value=1)) for i in range(3)]
+    running_process = mock_running_process(started)
+
+    with patch('app.tasks.worker.start_worker_process', AsyncMock(side_effect=[*crashed_processes, running_process])), \
+            patch('app.tasks.worker.asyncio.sleep', AsyncMock()) as mock_sleep, \
+            patch('app.tasks.worker.logger') as mock_logger:
+        task = asyncio.create_task(supervise_worker_process())
+        await started.wait()
+
+        # Verify each exit was logged, and the restart delay doubled each time
+        assert mock_logger.error.call_count == 3
+        assert "exited with code: 1" in mock_logger.error.call_args[0][0]
+        assert mock_sleep.await_args_list == [call(1), call(2), call(4)]
+
+        # Verify cancelling stops the running worker process
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        running_process.terminate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_supervise_worker_process_start_failure():
+    """Test that a worker process that fails to start is retried."""
+    started = asyncio.Event()
+    running_process = mock_running_process(started)
+
+    with patch('app.tasks.worker.start_worker_process',
+               AsyncMock(side_effect=[OSError("Exec failed"), running_process])) as mock_start, \
+            patch('app.tasks.worker.asyncio.sleep', AsyncMock()), \
+            patch('app.tasks.worker.logger') as mock_logger:
+        task = asyncio.create_task(supervise_worker_process())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert mock_start.await_count == 2
+        mock_logger.error.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_shared_clients():
+    """Test that the shared clients are warmed up on entry, and closed on exit."""
+    with patch('app.tasks.worker.warm_up_storage') as mock_warm_up, \
+            patch('app.tasks.worker.close_scheduler_session') as mock_close_scheduler, \
+            patch('app.tasks.worker.close_storage') as mock_close_storage:
+        async with shared_clients():
+            mock_warm_up.assert_awaited_once()
+            mock_close_storage.assert_not_awaited()
+
+        mock_close_scheduler.assert_awaited_once()
+        mock_close_storage.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_shared_clients_without_warm_up():
+    """Test that the shared clients are closed, even when not warmed up, and on errors."""
+    with patch('app.tasks.worker.warm_up_storage') as mock_warm_up, \
+            patch('app.tasks.worker.close_scheduler_session') as mock_close_scheduler, \
+            patch('app.tasks.worker.close_storage') as mock_close_storage:
+        with pytest.raises(RuntimeError):
+            async with shared_clients(warm_up=False):
+                raise RuntimeError("Startup failed")
+
+        mock_warm_up.assert_not_awaited()
+        mock_close_scheduler.assert_awaited_once()
+        mock_close_storage.assert_awaited_once()